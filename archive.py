@@ -0,0 +1,177 @@
+import os
+import gzip
+import json
+import hashlib
+import pathlib
+import threading
+from urllib.parse import urlsplit
+from datetime import datetime, timezone
+
+# --- Config (env or defaults) ---
+ARCHIVE_DIR = pathlib.Path(os.getenv("STATS_ARCHIVE_DIR", "data/archive"))
+COMPRESS_LEVEL = int(os.getenv("STATS_ARCHIVE_LEVEL", "6"))
+
+
+def team_for(url: str) -> str:
+    """Team slug of an ESPN team URL (…/name/pit → pit)."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+
+class PageArchive:
+    """
+    Every fetched page, content-addressed under archive_dir:
+      - objects/ab/<sha256>.html.gz holds each distinct body once (gzip)
+      - index.jsonl has one line per fetch: sha, url, team, fetched_at, bytes, etag, last_modified
+    Re-fetching an unchanged page only appends an index line.
+    """
+
+    def __init__(self, archive_dir: pathlib.Path = ARCHIVE_DIR):
+        self.dir = pathlib.Path(archive_dir)
+        self.index_path = self.dir / "index.jsonl"
+        self._lock = threading.Lock()
+
+    def object_path(self, sha: str) -> pathlib.Path:
+        return self.dir / "objects" / sha[:2] / f"{sha}.html.gz"
+
+    # --- Writes ---
+    def put(self, url: str, body: bytes, fetched_at: str | None = None, team: str | None = None,
+            headers: dict | None = None) -> dict:
+        """Store `body` (if new) and index this fetch. Returns the index entry."""
+        sha = hashlib.sha256(body).hexdigest()
+        path = self.object_path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(gzip.compress(body, COMPRESS_LEVEL, mtime=0))
+            tmp.replace(path)
+
+        headers = headers or {}
+        entry = {
+            "sha": sha,
+            "url": url,
+            "team": team or team_for(url),
+            "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(),
+            "bytes": len(body),
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        with self._lock, open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+    # --- Reads ---
+    def get(self, sha: str) -> bytes:
+        return gzip.decompress(self.object_path(sha).read_bytes())
+
+    def entries(self, team: str | None = None, url: str | None = None,
+                since: str | None = None, until: str | None = None) -> list[dict]:
+        """Index entries in fetch order, filtered by team, url and ISO timestamp range."""
+        if not self.index_path.exists():
+            return []
+        out = []
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                e = json.loads(line)
+                if ((team and e["team"] != team) or (url and e["url"] != url)
+                        or (since and e["fetched_at"] < since) or (until and e["fetched_at"] > until)):
+                    continue
+                out.append(e)
+        return sorted(out, key=lambda e: e["fetched_at"])
+
+    def stats(self) -> dict:
+        objects = list((self.dir / "objects").glob("*/*.html.gz"))
+        entries = self.entries()
+        return {
+            "fetches": len(entries),
+            "pages": len(objects),
+            "raw_bytes": sum(e["bytes"] for e in {e["sha"]: e for e in entries}.values()),
+            "stored_bytes": sum(p.stat().st_size for p in objects),
+        }
+
+
+_archive = None
+
+
+def archive_response(r) -> None:
+    """Collector hook: archive a successful requests.Response. Never fails the fetch."""
+    global _archive
+    if os.getenv("STATS_ARCHIVE", "1") != "1":
+        return
+    try:
+        _archive = _archive or PageArchive()
+        _archive.put(r.url, r.content, headers=r.headers)
+    except OSError as e:
+        print(f"⚠️ Could not archive {r.url}: {e}")
+
+
+# --- Replay: archived pages through the collector's extraction, no network ---
+def replay(teams: list[str] | None = None, since: str | None = None, until: str | None = None,
+           latest: bool = False, into: str = "teams", history: bool = False,
+           archive: PageArchive | None = None) -> int:
+    """
+    Feed archived pages through collector.save_team (into="teams") or
+    collector.save_stats (into="stats") in fetch order. Each page is tagged with
+    the NFL week of its fetch date. `latest` replays only each team's newest page.
+    Returns the number of pages replayed.
+    """
+    from collector import save_stats, save_team
+    from history import nfl_season_week
+
+    archive = archive or PageArchive()
+    entries = [e for e in archive.entries(since=since, until=until) if not teams or e["team"] in teams]
+    if latest:
+        entries = list({e["team"]: e for e in entries}.values())
+    if into == "stats" and len({e["team"] for e in entries}) > 1:
+        raise ValueError("❌ Replaying into data/steelers_stats.json needs a single team (--teams pit)")
+
+    for e in entries:
+        html = archive.get(e["sha"]).decode("utf-8", errors="replace")
+        season, week = nfl_season_week(datetime.fromisoformat(e["fetched_at"]).date())
+        if into == "stats":
+            save_stats(e["url"], html, season, week, {"ETag": e["etag"], "Last-Modified": e["last_modified"]},
+                       e["fetched_at"], history)
+        else:
+            save_team(e["team"], html, season, week, e["fetched_at"], history)
+    print(f"🔁 Replayed {len(entries)} archived page(s) from {archive.dir}")
+    return len(entries)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Content-addressed archive of fetched ESPN pages.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    ls = sub.add_parser("list", help="list archived fetches")
+    ls.add_argument("--team")
+
+    sub.add_parser("stats", help="archive size and dedup ratio")
+
+    rp = sub.add_parser("replay", help="re-extract archived pages without the network")
+    rp.add_argument("--teams", help="comma-separated team slugs (default: every archived team)")
+    rp.add_argument("--since", help="ISO timestamp (fetched at or after)")
+    rp.add_argument("--until", help="ISO timestamp (fetched at or before)")
+    rp.add_argument("--latest", action="store_true", help="only each team's newest page")
+    rp.add_argument("--into", choices=["teams", "stats"], default="teams",
+                    help="data/teams/<slug>.json, or data/steelers_stats.json for one team")
+    rp.add_argument("--history", action="store_true", help="also add the replayed weeks to the history")
+
+    args = parser.parse_args()
+    archive = PageArchive()
+
+    if args.cmd == "list":
+        for e in archive.entries(team=args.team):
+            print(f"{e['fetched_at']}  {e['team']:<4} {e['sha'][:12]}  {e['bytes']:>9,} B  {e['url']}")
+    elif args.cmd == "stats":
+        s = archive.stats()
+        ratio = s["raw_bytes"] / s["stored_bytes"] if s["stored_bytes"] else 0
+        print(f"{s['fetches']} fetch(es), {s['pages']} distinct page(s), "
+              f"{s['raw_bytes']:,} B raw → {s['stored_bytes']:,} B stored ({ratio:.1f}x)")
+    elif args.cmd == "replay":
+        teams = [t.strip().lower() for t in args.teams.split(",")] if args.teams else None
+        try:
+            replay(teams, args.since, args.until, args.latest, args.into, args.history, archive)
+        except ValueError as e:
+            raise SystemExit(str(e))
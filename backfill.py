@@ -0,0 +1,230 @@
+import os
+import re
+import json
+import time
+import pathlib
+import tarfile
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from table_extractor import extract_tables
+
+DATA_DIR = pathlib.Path("data")
+PARSED_DIR = DATA_DIR / "backfill"
+
+# --- Tuning (env or defaults) ---
+WORKERS = int(os.getenv("BACKFILL_WORKERS", str(os.cpu_count() or 1)))
+CHUNK_PAGES = int(os.getenv("BACKFILL_CHUNK_PAGES", "8"))  # pages per task sent to a worker
+
+HTML_SUFFIXES = (".html", ".htm")
+SEASON_RE = re.compile(r"^(?:19|20)\d\d$")
+WEEK_RE = re.compile(r"^(?:wk|week|w)?(\d{1,2})$")
+
+
+def page_tag(name: str, teams: set, default_season: int | None = None) -> tuple[str, int, int] | None:
+    """
+    (team, season, week) from a saved page's path, e.g. pit/2025-wk05.html,
+    pit_2025_5.html or 2025/week5/pit.htm. The team is the first path token
+    that is an NFL team slug; season falls back to `default_season`.
+    """
+    tokens = [t for t in re.split(r"[/\\_\-. ]+", name.lower().rsplit(".", 1)[0]) if t]
+    team = next((t for t in tokens if t in teams), None)
+    season = next((int(t) for t in tokens if SEASON_RE.match(t)), default_season)
+    week = next((int(m.group(1)) for t in tokens if not SEASON_RE.match(t) and (m := WEEK_RE.match(t))), None)
+    if team is None or season is None or week is None:
+        return None
+    return team, season, week
+
+
+def parsed_path(out_dir: pathlib.Path, team: str, season: int, week: int) -> pathlib.Path:
+    return out_dir / team / f"{season}-{week:02d}.json"
+
+
+# --- Sources: a directory tree or a tarball of saved pages ---
+def list_pages(source: pathlib.Path) -> list[str]:
+    """Names of the HTML pages in `source`, in the order they are stored."""
+    if source.is_dir():
+        return [str(p.relative_to(source)) for p in sorted(source.rglob("*"))
+                if p.suffix.lower() in HTML_SUFFIXES and p.is_file()]
+    with tarfile.open(source, "r:*") as tar:
+        return [m.name for m in tar.getmembers() if m.isfile() and m.name.lower().endswith(HTML_SUFFIXES)]
+
+
+def read_pages(source: pathlib.Path, wanted: set):
+    """Yield (name, html bytes) for the pages in `wanted`, reading the source front to back once."""
+    if source.is_dir():
+        for name in sorted(wanted):
+            yield name, (source / name).read_bytes()
+        return
+    with tarfile.open(source, "r:*") as tar:
+        for member in tar:
+            if member.name in wanted:
+                yield member.name, tar.extractfile(member).read()
+
+
+# --- Worker side ---
+def parse_chunk(chunk: list) -> list:
+    """[(name, tag, html bytes)] → [(name, tag, tables)]. Runs in a worker process."""
+    return [(name, tag, extract_tables(html.decode("utf-8", errors="replace"))) for name, tag, html in chunk]
+
+
+def _write_json(path: pathlib.Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _progress(done: int, total: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    rate = done / elapsed if elapsed else 0.0
+    eta = (total - done) / rate if rate else 0.0
+    print(f"⏳ {done}/{total} pages ({done / total:.0%}), {rate:.1f} pages/s, ETA {eta:.0f}s", flush=True)
+
+
+def parse_pages(source: pathlib.Path, out_dir: pathlib.Path = PARSED_DIR, season: int | None = None,
+                workers: int = WORKERS, chunk_pages: int = CHUNK_PAGES) -> dict:
+    """
+    Parse every page in `source` across a process pool into
+    out_dir/<team>/<season>-<week>.json. Pages whose parsed file already exists
+    are skipped, so an interrupted backfill resumes where it stopped.
+    Returns {(team, season, week): parsed path} for every page in the source.
+    """
+    from collector import NFL_TEAMS
+
+    if season is None:
+        from history import nfl_season_week
+        season = nfl_season_week()[0]
+    teams = set(NFL_TEAMS)
+    by_tag, skipped = {}, []
+    for name in list_pages(source):
+        tag = page_tag(name, teams, season)
+        if tag is None:
+            skipped.append(name)
+            continue
+        if tag in by_tag:
+            print(f"⚠️ {name} and {by_tag[tag]} are both {tag}; keeping {name}")
+        by_tag[tag] = name
+    tags = {name: tag for tag, name in by_tag.items()}
+    if skipped:
+        print(f"⚠️ Skipping {len(skipped)} page(s) without a team slug and week in the name, e.g. {skipped[0]}")
+
+    todo = {name for name, tag in tags.items() if not parsed_path(out_dir, *tag).exists()}
+    print(f"📂 {len(tags)} page(s) in {source}; {len(tags) - len(todo)} already parsed, {len(todo)} to go "
+          f"on {workers} worker(s)")
+
+    started, done, reported = time.perf_counter(), 0, 0.0
+    if todo:
+        pages = read_pages(source, todo)
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+            in_flight = set()
+            while True:
+                # Keep about two chunks per worker queued, so reading stays just ahead of parsing
+                while len(in_flight) < 2 * max(1, workers):
+                    chunk = [(name, tags[name], html) for name, html in _take(pages, chunk_pages)]
+                    if not chunk:
+                        break
+                    in_flight.add(pool.submit(parse_chunk, chunk))
+                if not in_flight:
+                    break
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    for name, tag, tables in fut.result():
+                        _write_json(parsed_path(out_dir, *tag), {"source": name, "tables": tables})
+                        done += 1
+                if time.perf_counter() - reported >= 1 or done == len(todo):
+                    reported = time.perf_counter()
+                    _progress(done, len(todo), started)
+
+    elapsed = time.perf_counter() - started
+    if done:
+        print(f"✅ Parsed {done} page(s) in {elapsed:.1f}s ({done / elapsed:.1f} pages/s)")
+    return {tag: parsed_path(out_dir, *tag) for tag in tags.values()}
+
+
+def _take(iterator, n: int) -> list:
+    out = []
+    for item in iterator:
+        out.append(item)
+        if len(out) == n:
+            break
+    return out
+
+
+def team_file_tag(path: pathlib.Path) -> tuple[int, int] | None:
+    """(season, week) of a data/teams/<slug>.json; files from before the tag use their extraction date."""
+    from history import nfl_season_week
+
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if "season" in data and "week" in data:
+        return data["season"], data["week"]
+    return nfl_season_week(datetime.fromisoformat(data["extracted_at"]).date()) if data.get("extracted_at") else None
+
+
+def write_outputs(parsed: dict, history: bool = True) -> None:
+    """
+    Per team, every week is merged into its history in (season, week) order
+    (weeks already there are skipped, so this step resumes too; older weeks
+    rebuild the chain). The latest week replaces data/teams/<slug>.json (the
+    collect_teams format) only if it is newer than the week already there.
+    """
+    from collector import TEAMS_DIR, TEAM_URL, save_snapshot, tables_hash
+    from history import HistoryStore
+
+    by_team = {}
+    for (team, season, week), path in parsed.items():
+        by_team.setdefault(team, []).append((season, week, path))
+
+    TEAMS_DIR.mkdir(parents=True, exist_ok=True)
+    for team, weeks in sorted(by_team.items()):
+        weeks.sort()
+        added = 0
+        if history:
+            added = HistoryStore(team).merge(
+                [(season, week, json.loads(path.read_text(encoding="utf-8"))["tables"]) for season, week, path in weeks])
+
+        season, week, path = weeks[-1]
+        current = team_file_tag(TEAMS_DIR / f"{team}.json")
+        if current is not None and current >= (season, week):
+            print(f"🗂️  {team}: {len(weeks)} week(s), {added} new history snapshot(s); kept "
+                  f"{TEAMS_DIR / f'{team}.json'} ({current[0]} wk {current[1]} is not older than {season} wk {week})")
+            continue
+        tables = json.loads(path.read_text(encoding="utf-8"))["tables"]
+        (TEAMS_DIR / f"{team}.json").write_text(json.dumps({
+            "team": team,
+            "source_url": TEAM_URL.format(slug=team),
+            "extracted_at": datetime.now(timezone.utc).isoformat(),
+            "content_hash": tables_hash(tables),
+            "season": season,
+            "week": week,
+            "tables": tables,
+        }, indent=2), encoding="utf-8")
+        save_snapshot(tables, TEAMS_DIR / f"{team}.arrow")
+        print(f"🗂️  {team}: {len(weeks)} week(s), latest {season} wk {week}, {added} new history snapshot(s)")
+
+
+def backfill(source: pathlib.Path, season: int | None = None, workers: int = WORKERS,
+             chunk_pages: int = CHUNK_PAGES, out_dir: pathlib.Path = PARSED_DIR, history: bool = True) -> dict:
+    source = pathlib.Path(source)
+    if not source.exists():
+        raise SystemExit(f"❌ {source} not found.")
+    parsed = parse_pages(source, out_dir, season, workers, chunk_pages)
+    write_outputs(parsed, history)
+    return parsed
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild team stats and history from saved ESPN pages (a directory or tarball).")
+    parser.add_argument("source", type=pathlib.Path, help="directory or .tar/.tar.gz of team-stats pages")
+    parser.add_argument("--season", type=int, help="season for pages whose names have none")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="parser processes (default: every core)")
+    parser.add_argument("--chunk", type=int, default=CHUNK_PAGES, help="pages per task sent to a worker")
+    parser.add_argument("--out", type=pathlib.Path, default=PARSED_DIR, help="parsed pages (the resume point)")
+    parser.add_argument("--no-history", action="store_true", help="only write data/teams, skip the history")
+    args = parser.parse_args()
+
+    backfill(args.source, args.season, args.workers, args.chunk, args.out, not args.no_history)
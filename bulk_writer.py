@@ -0,0 +1,104 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Config (env or defaults) ---
+CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+MAX_IN_FLIGHT = int(os.getenv("BULK_MAX_IN_FLIGHT", "4"))
+
+
+class BulkWriter:
+    """
+    Buffer rows and insert them into a storage table (see storage.py) in chunks:
+      - one insert request per `chunk_size` rows
+      - at most `max_in_flight` requests running at once
+      - close() flushes the tail, waits, and reports rows/sec + request count
+    """
+
+    def __init__(self, storage, table: str = "steelers_stats",
+                 chunk_size: int = CHUNK_SIZE, max_in_flight: int = MAX_IN_FLIGHT):
+        self.storage = storage
+        self.table = table
+        self.chunk_size = max(1, chunk_size)
+        self.max_in_flight = max(1, max_in_flight)
+
+        self._buffer = []
+        self._futures = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        self._started = time.perf_counter()
+
+        self.rows_written = 0
+        self.requests = 0
+
+    def add(self, row: dict) -> None:
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self._flush_buffer()
+
+    def extend(self, rows) -> None:
+        for row in rows:
+            self.add(row)
+
+    def _flush_buffer(self) -> None:
+        if not self._buffer:
+            return
+        chunk, self._buffer = self._buffer, []
+        self._raise_failed()
+
+        # Blocks the producer while max_in_flight chunks are still being sent
+        self._slots.acquire()
+        fut = self._pool.submit(self._send, chunk)
+        fut.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(fut)
+
+    def _send(self, chunk: list) -> None:
+        self.storage.insert(self.table, chunk)
+        with self._lock:
+            self.rows_written += len(chunk)
+            self.requests += 1
+
+    def _raise_failed(self) -> None:
+        pending = []
+        for fut in self._futures:
+            if fut.done():
+                fut.result()  # re-raises a failed chunk
+            else:
+                pending.append(fut)
+        self._futures = pending
+
+    def close(self) -> dict:
+        """Flush remaining rows, wait for every request, and return load stats."""
+        try:
+            self._flush_buffer()
+            for fut in self._futures:
+                fut.result()
+        finally:
+            self._futures = []
+            self._pool.shutdown(wait=True)
+
+        elapsed = time.perf_counter() - self._started
+        rate = self.rows_written / elapsed if elapsed > 0 else 0.0
+        print(
+            f"✅ Wrote {self.rows_written} rows to {self.table} "
+            f"in {self.requests} request(s), {elapsed:.2f}s ({rate:,.0f} rows/sec)"
+        )
+        return {
+            "table": self.table,
+            "rows": self.rows_written,
+            "requests": self.requests,
+            "seconds": elapsed,
+            "rows_per_sec": rate,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        return False
@@ -1,7 +1,14 @@
 import os
+import time
+import random
 import pathlib
+import hashlib
+import threading
 import requests
-from bs4 import BeautifulSoup
+import metrics
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from table_extractor import extract_tables
 from datetime import datetime, timezone
 import json
 
@@ -9,20 +16,54 @@ DATA_DIR = pathlib.Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 JSON_PATH = DATA_DIR / "steelers_stats.json"
 META_PATH = DATA_DIR / "meta.txt"
+TEAMS_DIR = DATA_DIR / "teams"
 
-def collect_stats(url: str) -> None:
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0.0.0 Safari/537.36"
-        )
-    }
+TEAM_URL = "https://www.espn.com/nfl/team/stats/_/name/{slug}"
+NFL_TEAMS = [
+    "ari", "atl", "bal", "buf", "car", "chi", "cin", "cle",
+    "dal", "den", "det", "gb", "hou", "ind", "jax", "kc",
+    "lv", "lac", "lar", "mia", "min", "ne", "no", "nyg",
+    "nyj", "phi", "pit", "sf", "sea", "tb", "ten", "wsh",
+]
 
-    r = requests.get(url, headers=headers, timeout=30)
-    r.raise_for_status()
+# --- Multi-team fetch tuning (env or defaults) ---
+MAX_WORKERS = int(os.getenv("COLLECT_MAX_WORKERS", "8"))
+HOST_RATE = float(os.getenv("COLLECT_HOST_RATE", "4"))  # requests/sec per host
+RETRIES = int(os.getenv("COLLECT_RETRIES", "3"))
+BACKOFF = float(os.getenv("COLLECT_BACKOFF", "0.5"))    # seconds, doubled per attempt
+TIMEOUT = float(os.getenv("COLLECT_TIMEOUT", "30"))
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/123.0.0.0 Safari/537.36"
+)
+
+# One keep-alive session for every fetch in this process
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": USER_AGENT})
+
+def read_meta() -> dict:
+    meta = {}
+    if META_PATH.exists():
+        for line in META_PATH.read_text(encoding="utf-8").splitlines():
+            if "=" in line:
+                k, v = line.split("=", 1)
+                meta[k.strip()] = v.strip()
+    return meta
+
+def write_meta(meta: dict) -> None:
+    META_PATH.write_text(
+        "\n".join(f"{k}={v}" for k, v in meta.items() if v is not None),
+        encoding="utf-8",
+    )
 
-    soup = BeautifulSoup(r.text, "html.parser")
+def extract_tables_bs4(html: str) -> dict:
+    """Reference full-tree BeautifulSoup extractor (extract_tables must match it exactly)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
 
     stats_data = {}
 
@@ -36,17 +77,253 @@ def collect_stats(url: str) -> None:
                 rows.append(dict(zip(headers, cells)))
         stats_data[f"table_{idx}"] = {"headers": headers, "rows": rows}
 
-    JSON_PATH.write_text(json.dumps(stats_data, indent=2), encoding="utf-8")
+    return stats_data
 
-    META_PATH.write_text(
-        f"source_url={url}\nextracted_at={datetime.now(timezone.utc).isoformat()}",
-        encoding="utf-8",
+def save_snapshot(stats_data: dict, path: pathlib.Path | None = None) -> None:
+    """Also write the typed columnar snapshot next to the JSON (skipped if pandas/pyarrow are missing)."""
+    try:
+        from snapshot import SNAPSHOT_PATH, write_snapshot
+        out = write_snapshot(stats_data, path or SNAPSHOT_PATH)
+        print(f"Saved columnar snapshot to {out}")
+    except (ImportError, RuntimeError) as e:
+        print(f"⚠️ Skipping columnar snapshot: {e}")
+
+def save_history(stats_data: dict, team: str, season: int | None = None, week: int | None = None,
+                 taken_at: str | None = None) -> None:
+    """Add a week-tagged delta snapshot to data/history/<team>."""
+    try:
+        from history import record_history
+        record_history(stats_data, team, season, week, taken_at)
+    except (ImportError, ValueError) as e:
+        print(f"⚠️ Skipping history snapshot: {e}")
+
+def save_page(r: requests.Response) -> None:
+    """Keep the raw HTML in the content-addressed page archive (set STATS_ARCHIVE=0 to disable)."""
+    from archive import archive_response
+    archive_response(r)
+
+def parse_page(html: str, team: str = "") -> dict:
+    """extract_tables, timed, with the tables and rows it found counted."""
+    with metrics.span("parse", team=team) as s:
+        stats_data = extract_tables(html)
+        s.add(chars=len(html))
+    metrics.count("tables_extracted", len(stats_data), team=team)
+    metrics.count("rows_extracted", sum(len(t["rows"]) for t in stats_data.values()), team=team)
+    return stats_data
+
+def tables_hash(stats_data: dict) -> str:
+    """Stable content hash of the extracted tables (ignores page chrome/ads)."""
+    canonical = json.dumps(stats_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class HostRateLimiter:
+    """Space out requests so each host sees at most `rate` requests/sec."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_local = threading.local()
+
+def _thread_session() -> requests.Session:
+    # requests.Session is not guaranteed thread-safe; keep one keep-alive session per worker
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+        _local.session.headers.update({"User-Agent": USER_AGENT})
+    return _local.session
+
+def fetch_with_retry(url: str, limiter: HostRateLimiter | None = None,
+                     retries: int = RETRIES, backoff: float = BACKOFF,
+                     timeout: float = TIMEOUT, stream: bool = False) -> requests.Response:
+    """
+    GET with a per-host rate limit, timeout, and exponential backoff on transient errors.
+    With stream=True only the headers are read: the body (and archiving it) is the caller's.
+    """
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.wait(url)
+        try:
+            with metrics.span("fetch", host=urlsplit(url).netloc) as s:
+                r = _thread_session().get(url, timeout=timeout, stream=stream)
+                s.add(status=r.status_code)
+                if not stream:
+                    s.add(bytes=len(r.content))
+            if not stream:
+                metrics.count("bytes_downloaded", len(r.content), host=urlsplit(url).netloc)
+            if r.status_code not in RETRY_STATUS or attempt == retries:
+                r.raise_for_status()
+                if not stream:
+                    save_page(r)
+                return r
+            r.close()
+            retry_after = r.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else backoff * 2 ** attempt
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+        time.sleep(delay + random.uniform(0, backoff))
+    raise RuntimeError("unreachable")
+
+def save_team(slug: str, html: str, season: int | None = None, week: int | None = None,
+              extracted_at: str | None = None, history: bool = True) -> pathlib.Path:
+    """Extract a team page into data/teams/<slug>.json (+ snapshot and history)."""
+    from history import nfl_season_week
+
+    url = TEAM_URL.format(slug=slug)
+    stats_data = parse_page(html, slug)
+    extracted_at = extracted_at or datetime.now(timezone.utc).isoformat()
+    # Tagged like its history snapshot, so a backfill of older weeks never replaces it
+    guess_season, guess_week = nfl_season_week(datetime.fromisoformat(extracted_at).date())
+    season, week = season or guess_season, week or guess_week
+
+    TEAMS_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = TEAMS_DIR / f"{slug}.json"
+    out_path.write_text(json.dumps({
+        "team": slug,
+        "source_url": url,
+        "extracted_at": extracted_at,
+        "content_hash": tables_hash(stats_data),
+        "season": season,
+        "week": week,
+        "tables": stats_data,
+    }, indent=2), encoding="utf-8")
+    save_snapshot(stats_data, TEAMS_DIR / f"{slug}.arrow")
+    if history:
+        save_history(stats_data, slug, season, week, extracted_at)
+    return out_path
+
+def _collect_team(slug: str, limiter: HostRateLimiter,
+                  season: int | None = None, week: int | None = None) -> pathlib.Path:
+    r = fetch_with_retry(TEAM_URL.format(slug=slug), limiter)
+    return save_team(slug, r.text, season, week)
+
+def collect_teams(slugs: list[str], max_workers: int = MAX_WORKERS,
+                  rate: float = HOST_RATE, season: int | None = None, week: int | None = None) -> dict:
+    """
+    Fetch several teams concurrently into data/teams/<slug>.json.
+    Returns {slug: path} for successes; failures are reported and skipped.
+    """
+    TEAMS_DIR.mkdir(parents=True, exist_ok=True)
+    limiter = HostRateLimiter(rate)
+    started = time.perf_counter()
+
+    saved, failed = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(slugs)))) as pool:
+        futures = {pool.submit(_collect_team, slug, limiter, season, week): slug for slug in slugs}
+        for fut in as_completed(futures):
+            slug = futures[fut]
+            try:
+                saved[slug] = fut.result()
+            except Exception as e:
+                failed[slug] = e
+                print(f"❌ {slug}: {e}")
+
+    elapsed = time.perf_counter() - started
+    print(f"Saved {len(saved)}/{len(slugs)} team stats files to {TEAMS_DIR} in {elapsed:.1f}s")
+    return saved
+
+def collect_stats(url: str, season: int | None = None, week: int | None = None) -> bool:
+    """
+    Fetch and save the stats tables for `url`.
+    Returns True when new data was written; False when the page (or its
+    tables) are unchanged since the last run. meta.txt records `changed=0|1`
+    so downstream stages can skip work. New data is also added to the
+    history tagged (season, week) (guessed from today's date when omitted).
+    """
+    meta = read_meta()
+    now_iso = datetime.now(timezone.utc).isoformat()
+
+    # Conditional request: only valid if we still have the data it refers to
+    cond = {}
+    if meta.get("source_url") == url and JSON_PATH.exists():
+        if meta.get("etag"):
+            cond["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            cond["If-Modified-Since"] = meta["last_modified"]
+
+    with metrics.span("fetch", host=urlsplit(url).netloc) as s:
+        r = SESSION.get(url, headers=cond, timeout=30)
+        s.add(status=r.status_code, bytes=len(r.content))
+    metrics.count("bytes_downloaded", len(r.content), host=urlsplit(url).netloc)
+
+    if r.status_code == 304:
+        meta.update(checked_at=now_iso, changed="0")
+        write_meta(meta)
+        print(f"⏭️  {url} not modified (HTTP 304); keeping {JSON_PATH}")
+        return False
+
+    r.raise_for_status()
+    save_page(r)
+    return save_stats(url, r.text, season, week, r.headers, now_iso)
+
+def save_stats(url: str, html: str, season: int | None = None, week: int | None = None,
+               headers: dict | None = None, fetched_at: str | None = None, history: bool = True) -> bool:
+    """
+    Extract a fetched (or archived) page into data/steelers_stats.json, the
+    snapshot and the history, and update meta.txt. Returns True on new data.
+    """
+    meta = read_meta()
+    now_iso = fetched_at or datetime.now(timezone.utc).isoformat()
+    headers = headers or {}
+    team = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+    stats_data = parse_page(html, team)
+    content_hash = tables_hash(stats_data)
+    changed = (
+        content_hash != meta.get("content_hash")
+        or meta.get("source_url") != url
+        or not JSON_PATH.exists()
     )
 
-    print(f"Saved stats JSON to {JSON_PATH} with {len(stats_data)} tables")
+    if changed:
+        JSON_PATH.write_text(json.dumps(stats_data, indent=2), encoding="utf-8")
+        save_snapshot(stats_data)
+        if history:
+            save_history(stats_data, team, season, week, fetched_at)
+
+    write_meta({
+        "source_url": url,
+        "extracted_at": now_iso if changed else meta.get("extracted_at", now_iso),
+        "checked_at": now_iso,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "content_hash": content_hash,
+        "changed": "1" if changed else "0",
+    })
+
+    if changed:
+        print(f"Saved stats JSON to {JSON_PATH} with {len(stats_data)} tables")
+    else:
+        print(f"⏭️  Tables unchanged (sha256 {content_hash[:12]}); keeping {JSON_PATH}")
+    return changed
 
 if __name__ == "__main__":
-    url = "https://www.espn.com/nfl/team/stats/_/name/pit"  # Steelers stats
-    collect_stats(url)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Scrape ESPN team stats tables.")
+    parser.add_argument("--teams", help="comma-separated team slugs (e.g. pit,cle,bal)")
+    parser.add_argument("--all-teams", action="store_true", help="scrape all 32 teams")
+    parser.add_argument("--season", type=int, help="history tag (default: guessed from today)")
+    parser.add_argument("--week", type=int, help="history tag (default: guessed from today)")
+    args = parser.parse_args()
 
+    if args.all_teams or args.teams:
+        slugs = NFL_TEAMS if args.all_teams else [t.strip().lower() for t in args.teams.split(",") if t.strip()]
+        collect_teams(slugs, season=args.season, week=args.week)
+    else:
+        url = "https://www.espn.com/nfl/team/stats/_/name/pit"  # Steelers stats
+        collect_stats(url, args.season, args.week)
 
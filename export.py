@@ -0,0 +1,245 @@
+import os
+import json
+import time
+import random
+import pathlib
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from storage import Storage
+
+DATA_DIR = pathlib.Path("data")
+EXPORT_DIR = pathlib.Path(os.getenv("STATS_EXPORT_DIR", DATA_DIR / "export"))
+
+# --- Tuning (env or defaults) ---
+WORKERS = int(os.getenv("EXPORT_WORKERS", "4"))
+PAGE_SIZE = int(os.getenv("STATS_PAGE_SIZE", "1000"))  # rows per keyset request
+RANGES_PER_WORKER = 4  # more ranges than workers, so one slow range doesn't leave the others idle
+RETRIES = int(os.getenv("EXPORT_RETRIES", "3"))
+BACKOFF = float(os.getenv("EXPORT_BACKOFF", "1.0"))
+
+# Arrow column types of the tables that can be exported (integer ids, see storage.SCHEMA)
+TABLE_COLUMNS = {
+    "steelers_stats": {"id": "int64", "category": "string", "player": "string", "stat_key": "string",
+                       "stat_value": "string", "player_id": "int64"},
+    "players": {"id": "int64", "name": "string", "key": "string"},
+}
+
+
+def export_path(table: str, out_dir: pathlib.Path = EXPORT_DIR) -> pathlib.Path:
+    return pathlib.Path(out_dir) / f"{table}.arrow"
+
+
+def key_ranges(lo: int, hi: int, parts: int) -> list[tuple[int, int]]:
+    """Split ids lo..hi into up to `parts` (after, upto] ranges of equal width."""
+    parts = max(1, min(parts, hi - lo + 1))
+    bounds = [lo - 1 + (hi - lo + 1) * i // parts for i in range(parts + 1)]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+# --- Reads ---
+def select_with_retry(storage: Storage, table: str, after: int, upto: int, limit: int,
+                      retries: int = RETRIES, backoff: float = BACKOFF) -> list:
+    """One keyset page, retried with exponential backoff; raises after the last attempt."""
+    for attempt in range(retries + 1):
+        try:
+            return storage.select(table, "*", order="id", limit=limit, after=after, upto=upto)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"⚠️ Read of {table} ids ({after}, {upto}] failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay + random.uniform(0, backoff))
+
+
+def read_range(storage: Storage, table: str, after: int, upto: int, page_size: int = PAGE_SIZE) -> list:
+    """
+    Every row with an id in (after, upto], page by page: each request starts
+    after the last id seen (keyset), so pages never shift under concurrent
+    inserts the way offset paging does.
+    """
+    rows, cursor = [], after
+    while True:
+        page = select_with_retry(storage, table, cursor, upto, page_size)
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        cursor = page[-1]["id"]
+
+
+# --- Snapshot file ---
+def _arrow_schema(table: str, meta: dict):
+    import pyarrow as pa
+
+    types = {"int64": pa.int64(), "string": pa.string()}
+    fields = [pa.field(col, types[kind]) for col, kind in TABLE_COLUMNS[table].items()]
+    return pa.schema(fields, metadata={b"steelers.export": json.dumps(meta).encode("utf-8")})
+
+
+def _batch(rows: list, schema):
+    """Rows → RecordBatch; JSON-ish cells (lists, numbers) in text columns are stored as JSON text."""
+    import pyarrow as pa
+
+    text = [f.name for f in schema if pa.types.is_string(f.type)]
+    for row in rows:
+        for col in text:
+            v = row.get(col)
+            if v is not None and not isinstance(v, str):
+                row[col] = json.dumps(v)
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+def export_table(storage: Storage, table: str = "steelers_stats", out_dir: pathlib.Path = EXPORT_DIR,
+                 workers: int = WORKERS, page_size: int = PAGE_SIZE) -> dict:
+    """
+    Copy `table` into out_dir/<table>.arrow (Arrow IPC, zstd): ids up to the
+    current max are split into keyset ranges read concurrently, and batches are
+    written in id order as ranges finish. The file only replaces the previous
+    export if the rows written match the table's count of those ids, both
+    before and after the read.
+    """
+    import pyarrow as pa
+
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"❌ Can't export {table!r} (exportable: {', '.join(TABLE_COLUMNS)})")
+    lo, hi, expected = storage.id_range(table)
+    meta = {"table": table, "backend": storage.name, "max_id": hi, "rows": expected,
+            "exported_at": datetime.now(timezone.utc).isoformat()}
+    schema = _arrow_schema(table, meta)
+    ranges = key_ranges(lo, hi, workers * RANGES_PER_WORKER) if expected else []
+    print(f"📤 {table}: {expected:,} row(s), ids {lo}..{hi}, {len(ranges)} range(s) on {workers} worker(s)")
+
+    path = export_path(table, out_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".arrow.tmp")
+    started, written = time.perf_counter(), 0
+    try:
+        with pa.OSFile(str(tmp), "wb") as sink, \
+                pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd")) as writer, \
+                ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            # Ranges are written in order; about two per worker are read ahead
+            todo, in_flight = iter(ranges), deque()
+            while True:
+                while len(in_flight) < 2 * max(1, workers) and (r := next(todo, None)):
+                    in_flight.append(pool.submit(read_range, storage, table, *r, page_size))
+                if not in_flight:
+                    break
+                rows = in_flight.popleft().result()
+                if rows:
+                    writer.write_batch(_batch(rows, schema))
+                    written += len(rows)
+
+        _, _, now = storage.id_range(table, upto=hi)
+        if written != expected or now != expected:
+            raise RuntimeError(f"❌ {table}: wrote {written:,} row(s) but the table had {expected:,} "
+                               f"ids <= {hi} at the start and {now:,} at the end; export discarded")
+        tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {table}: {written:,} row(s) → {path} ({path.stat().st_size:,} bytes) in {elapsed:.1f}s")
+    return {"table": table, "rows": written, "path": str(path), "seconds": elapsed}
+
+
+def read_export(table: str = "steelers_stats", out_dir: pathlib.Path = EXPORT_DIR):
+    """An exported table as pandas (memory-mapped Arrow read)."""
+    import pyarrow as pa
+
+    with pa.memory_map(str(export_path(table, out_dir)), "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def export_meta(table: str = "steelers_stats", out_dir: pathlib.Path = EXPORT_DIR) -> dict:
+    import pyarrow as pa
+
+    with pa.memory_map(str(export_path(table, out_dir)), "r") as source:
+        raw = (pa.ipc.open_file(source).schema.metadata or {}).get(b"steelers.export", b"{}")
+    return json.loads(raw)
+
+
+# --- Read-only backend over the exports (STATS_BACKEND=export) ---
+class ExportStorage(Storage):
+    """
+    The dashboard's reads (select/version) served from the exported files, so
+    it starts from the local copy instead of scanning the remote table.
+    """
+
+    name = "export"
+
+    def __init__(self, out_dir: pathlib.Path = EXPORT_DIR):
+        self.dir = pathlib.Path(out_dir)
+        if not export_path("steelers_stats", self.dir).exists():
+            raise RuntimeError(f"❌ No export in {self.dir}. Run `python export.py` first.")
+        self.frames = {}
+        self.player_ids = export_path("players", self.dir).exists()
+
+    @property
+    def target(self) -> str:
+        return f"{self.name}:{self.dir.resolve()}"
+
+    def _frame(self, table: str):
+        if table not in self.frames:
+            self.frames[table] = read_export(table, self.dir)
+        return self.frames[table]
+
+    def insert(self, table: str, rows: list) -> None:
+        raise RuntimeError("❌ The export backend is read-only.")
+
+    def upsert(self, table: str, rows: list, on_conflict: str = "id") -> None:
+        self.insert(table, rows)
+
+    def select(self, table: str, columns: str = "*", where: dict | None = None,
+               order: str = "id", limit: int | None = None, after: int | None = None,
+               upto: int | None = None) -> list:
+        df = self._frame(table)
+        for col, value in (where or {}).items():
+            df = df[df[col] == value]
+        if after is not None:
+            df = df[df["id"] > after]
+        if upto is not None:
+            df = df[df["id"] <= upto]
+        df = df.sort_values(order)
+        if columns.strip() != "*":
+            df = df[[c.strip() for c in columns.split(",")]]
+        if limit is not None:
+            df = df.head(limit)
+        df = df.astype(object)
+        return df.where(df.notna(), None).to_dict(orient="records")
+
+    def id_range(self, table: str = "steelers_stats", upto: int | None = None) -> tuple:
+        ids = self._frame(table)["id"]
+        if upto is not None:
+            ids = ids[ids <= upto]
+        return (int(ids.min()), int(ids.max()), len(ids)) if len(ids) else (None, None, 0)
+
+    def version(self, table: str = "steelers_stats") -> str:
+        meta = export_meta(table, self.dir)
+        return f"export:{meta['rows']}:{meta['max_id']}:{meta['exported_at']}"
+
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(
+        description="Copy storage tables into local compressed Arrow files (parallel keyset reads).")
+    parser.add_argument("--tables", default="steelers_stats,players",
+                        help=f"comma-separated tables (exportable: {', '.join(TABLE_COLUMNS)})")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="concurrent range readers")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="rows per keyset request")
+    parser.add_argument("--out", type=pathlib.Path, default=EXPORT_DIR, help="export directory")
+    args = parser.parse_args()
+
+    load_dotenv()
+    from storage import get_storage
+
+    storage = get_storage()
+    tables = [t.strip() for t in args.tables.split(",") if t.strip()]
+    if not storage.player_ids and "players" in tables:
+        tables.remove("players")  # no players table without the player_id migration
+    try:
+        for table in tables:
+            export_table(storage, table, args.out, args.workers, args.page_size)
+    except (ValueError, RuntimeError) as e:
+        raise SystemExit(str(e))
@@ -0,0 +1,304 @@
+import os
+import gzip
+import json
+import shutil
+import pathlib
+from datetime import date, datetime, timedelta, timezone
+
+# --- Config (env or defaults) ---
+HISTORY_DIR = pathlib.Path(os.getenv("STATS_HISTORY_DIR", "data/history"))
+# Every Nth snapshot is stored in full; the rest only hold changed cells
+CHECKPOINT_EVERY = int(os.getenv("STATS_CHECKPOINT_EVERY", "4"))
+
+
+def nfl_season_week(day: date | None = None) -> tuple[int, int]:
+    """
+    Approximate (season, week) for a date: week 1 starts the Tuesday before
+    kickoff (the Thursday after Labor Day). Pass an explicit week to be exact.
+    """
+    day = day or datetime.now(timezone.utc).date()
+    season = day.year if day.month >= 3 else day.year - 1
+    labor_day = date(season, 9, 1) + timedelta(days=(7 - date(season, 9, 1).weekday()) % 7)
+    week_one = labor_day + timedelta(days=1)  # Tuesday
+    return season, max(1, min(22, (day - week_one).days // 7 + 1))
+
+
+# --- Cell-level deltas ---
+def diff_tables(old: dict, new: dict) -> dict:
+    """
+    Changes that turn `old` tables into `new` ({"table_N": {"headers", "rows"}}):
+      headers  {table: headers} for new tables or changed header lists
+      nrows    {table: row count} where the count changed
+      cells    [[table, row, column, value], ...] for every differing cell
+      dropped  [table, ...] no longer on the page
+    """
+    delta = {"headers": {}, "nrows": {}, "cells": [], "dropped": [t for t in old if t not in new]}
+    for name, table in new.items():
+        before = old.get(name, {"headers": [], "rows": []})
+        if table.get("headers", []) != before.get("headers", []):
+            delta["headers"][name] = table.get("headers", [])
+        old_rows, new_rows = before.get("rows", []), table.get("rows", [])
+        if len(old_rows) != len(new_rows):
+            delta["nrows"][name] = len(new_rows)
+        for i, row in enumerate(new_rows):
+            prev = old_rows[i] if i < len(old_rows) else {}
+            if row == prev:
+                continue
+            for col, value in row.items():
+                if col not in prev or prev[col] != value:
+                    delta["cells"].append([name, i, col, value])
+            for col in prev.keys() - row.keys():
+                delta["cells"].append([name, i, col, None])
+    return delta
+
+
+def apply_delta(tables: dict, delta: dict) -> dict:
+    """Apply diff_tables() output in place and return `tables`."""
+    for name in delta.get("dropped", []):
+        tables.pop(name, None)
+    for name, headers in delta.get("headers", {}).items():
+        tables.setdefault(name, {"headers": [], "rows": []})["headers"] = list(headers)
+    for name, n in delta.get("nrows", {}).items():
+        rows = tables[name]["rows"]
+        del rows[n:]
+        rows.extend({} for _ in range(n - len(rows)))
+    for name, i, col, value in delta.get("cells", []):
+        row = tables[name]["rows"][i]
+        if value is None and col not in tables[name]["headers"]:
+            row.pop(col, None)
+        else:
+            row[col] = value
+    # keep each row's keys in header order, as the extractor produces them
+    for name in set(delta.get("headers", {})) | {c[0] for c in delta.get("cells", [])}:
+        headers = tables[name]["headers"]
+        tables[name]["rows"] = [{h: row[h] for h in headers if h in row} | row for row in tables[name]["rows"]]
+    return tables
+
+
+class HistoryStore:
+    """
+    Week-tagged scrape history for one team under history_dir/<team>/:
+      - index.json lists every snapshot in order (season, week, taken_at, kind, file)
+      - every `checkpoint_every`-th snapshot is a full copy; the rest are cell deltas
+      - several polls in one week are separate snapshots; the week's state is its last one
+    Reading any week replays at most checkpoint_every - 1 deltas.
+    """
+
+    def __init__(self, team: str = "pit", history_dir: pathlib.Path = HISTORY_DIR,
+                 checkpoint_every: int = CHECKPOINT_EVERY):
+        self.dir = pathlib.Path(history_dir) / team
+        self.checkpoint_every = max(1, checkpoint_every)
+        self.index_path = self.dir / "index.json"
+        self.index = json.loads(self.index_path.read_text(encoding="utf-8")) if self.index_path.exists() else []
+
+    # --- Files ---
+    def _write_json(self, path: pathlib.Path, data) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        tmp.replace(path)
+
+    def _read_json(self, name: str):
+        with gzip.open(self.dir / name, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_index(self) -> None:
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.index, indent=1), encoding="utf-8")
+        tmp.replace(self.index_path)
+
+    # --- Writes ---
+    def record(self, tables: dict, season: int | None = None, week: int | None = None,
+               taken_at: str | None = None) -> dict | None:
+        """
+        Add a snapshot tagged (season, week). Returns its index entry, or None
+        when nothing changed since the latest snapshot.
+        """
+        if season is None or week is None:
+            guess_season, guess_week = nfl_season_week()
+            season = guess_season if season is None else season
+            week = guess_week if week is None else week
+        if self.index and (season, week) < self._tag(self.index[-1]):
+            raise ValueError(f"❌ ({season}, week {week}) is older than the latest snapshot {self._tag(self.index[-1])}")
+
+        seq = len(self.index)
+        delta = diff_tables(self.state_at(seq - 1), tables)
+        if seq and not (delta["headers"] or delta["nrows"] or delta["cells"] or delta["dropped"]):
+            return None
+
+        entry = {"seq": seq, "season": season, "week": week,
+                 "taken_at": taken_at or datetime.now(timezone.utc).isoformat()}
+        self.dir.mkdir(parents=True, exist_ok=True)
+        if seq % self.checkpoint_every == 0:
+            entry.update(kind="checkpoint", file=f"{seq:06d}.full.json.gz")
+            self._write_json(self.dir / entry["file"], tables)
+        else:
+            entry.update(kind="delta", file=f"{seq:06d}.delta.json.gz", cells=len(delta["cells"]))
+            self._write_json(self.dir / entry["file"], delta)
+
+        self.index.append(entry)
+        self._save_index()
+        return entry
+
+    def merge(self, snapshots: list) -> int:
+        """
+        Add (season, week, tables) snapshots in any order; weeks already stored
+        are skipped. Weeks after the latest snapshot are appended. An older week
+        rebuilds the whole checkpoint/delta chain in (season, week) order, in a
+        sibling directory that replaces this one once complete. Returns how many
+        snapshots the history gained.
+        """
+        have = {self._tag(e) for e in self.index}
+        new = sorted((s for s in snapshots if (s[0], s[1]) not in have), key=lambda s: (s[0], s[1]))
+        if not new:
+            return 0
+        before, latest = len(self.index), self.latest_tag()
+        if latest is None or (new[0][0], new[0][1]) > latest:
+            for season, week, tables in new:
+                self.record(tables, season, week)
+            return len(self.index) - before
+
+        merged = [(self._tag(e), e["taken_at"], json.loads(json.dumps(tables))) for e, tables in self.states()]
+        merged += [((season, week), None, tables) for season, week, tables in new]
+        merged.sort(key=lambda m: m[0])  # stable: polls within a stored week keep their order
+        staging = self.dir.with_name(self.dir.name + ".rebuild")
+        shutil.rmtree(staging, ignore_errors=True)
+        fresh = HistoryStore(staging.name, self.dir.parent, self.checkpoint_every)
+        for (season, week), taken_at, tables in merged:
+            fresh.record(tables, season, week, taken_at)
+        old = self.dir.with_name(self.dir.name + ".old")
+        self.dir.rename(old)
+        staging.rename(self.dir)
+        shutil.rmtree(old)
+        self.index = fresh.index
+        return len(self.index) - before
+
+    # --- Reads ---
+    @staticmethod
+    def _tag(entry: dict) -> tuple[int, int]:
+        return entry["season"], entry["week"]
+
+    def latest_tag(self) -> tuple[int, int] | None:
+        """(season, week) of the newest snapshot; None for an empty history."""
+        return self._tag(self.index[-1]) if self.index else None
+
+    def seq_for(self, season: int, week: int) -> int | None:
+        """Latest snapshot taken at or before (season, week)."""
+        found = None
+        for entry in self.index:
+            if self._tag(entry) > (season, week):
+                break
+            found = entry["seq"]
+        return found
+
+    def state_at(self, seq: int) -> dict:
+        """Full tables as of snapshot `seq`: nearest checkpoint plus the deltas after it."""
+        if not 0 <= seq < len(self.index):
+            return {}
+        start = seq
+        while self.index[start]["kind"] != "checkpoint":
+            start -= 1
+        tables = self._read_json(self.index[start]["file"])
+        for entry in self.index[start + 1: seq + 1]:
+            apply_delta(tables, self._read_json(entry["file"]))
+        return tables
+
+    def week(self, season: int, week: int) -> dict:
+        """Tables as they stood at the end of (season, week); {} before the first snapshot."""
+        seq = self.seq_for(season, week)
+        return {} if seq is None else self.state_at(seq)
+
+    def states(self, since: tuple[int, int] | None = None):
+        """
+        Yield (entry, tables) for every snapshot from `since` on, applying each
+        delta once to a running state (one checkpoint read to start).
+        `tables` is that running state: copy it to keep a week.
+        """
+        first = 0 if since is None else self.seq_for(*since) or 0
+        tables = None
+        for entry in self.index[first:]:
+            if tables is None:
+                tables = self.state_at(entry["seq"])
+            elif entry["kind"] == "checkpoint":
+                tables = self._read_json(entry["file"])
+            else:
+                apply_delta(tables, self._read_json(entry["file"]))
+            yield entry, tables
+
+    def player_series(self, player: str, stat: str, section: str,
+                      since: tuple[int, int] | None = None) -> list[dict]:
+        """
+        One stat for one player across weeks (last poll of each week), e.g.
+        player_series("T.J. Watt", "SACK", "Defense Stats"). Names match by prefix,
+        since the extractor glues the position onto the name ("T.J. WattLB").
+        """
+        from sections import PAIR_MAP
+
+        names_tbl, stats_tbl = next(t for t, label in PAIR_MAP.items() if label == section)
+        by_week = {}
+        for entry, tables in self.states(since):
+            names = [str(next(iter(r.values()), "")) for r in tables.get(names_tbl, {}).get("rows", [])]
+            rows = tables.get(stats_tbl, {}).get("rows", [])
+            value = None
+            for i, name in enumerate(names):
+                if name.startswith(player) and i < len(rows):
+                    value = rows[i].get(stat)
+                    break
+            by_week[self._tag(entry)] = value
+        return [{"season": s, "week": w, "value": v} for (s, w), v in by_week.items()]
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self.dir.glob("*.gz"))
+
+
+def record_history(tables: dict, team: str = "pit", season: int | None = None, week: int | None = None,
+                   taken_at: str | None = None) -> None:
+    """Collector hook: add a week-tagged snapshot and report what was stored."""
+    store = HistoryStore(team)
+    entry = store.record(tables, season, week, taken_at)
+    if entry is None:
+        print(f"⏭️  History for {team} unchanged; no snapshot stored.")
+    elif entry["kind"] == "checkpoint":
+        print(f"🗂️  History {team} {entry['season']} wk {entry['week']}: full checkpoint #{entry['seq']}")
+    else:
+        print(f"🗂️  History {team} {entry['season']} wk {entry['week']}: {entry['cells']} changed cell(s)")
+
+
+if __name__ == "__main__":
+    import argparse
+    from sections import PAIR_MAP
+
+    parser = argparse.ArgumentParser(description="Week-by-week stats history (checkpoints + cell deltas).")
+    parser.add_argument("--team", default="pit")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    rec = sub.add_parser("record", help="store a scraped tables JSON as a snapshot")
+    rec.add_argument("path", type=pathlib.Path, nargs="?", default=pathlib.Path("data/steelers_stats.json"))
+    rec.add_argument("--season", type=int)
+    rec.add_argument("--week", type=int)
+
+    sub.add_parser("list", help="list stored snapshots")
+
+    show = sub.add_parser("week", help="print the tables as of a week")
+    show.add_argument("season", type=int)
+    show.add_argument("week", type=int)
+
+    series = sub.add_parser("series", help="one player's stat across weeks")
+    series.add_argument("player")
+    series.add_argument("stat")
+    series.add_argument("--section", default="Passing Stats", choices=list(PAIR_MAP.values()))
+
+    args = parser.parse_args()
+    store = HistoryStore(args.team)
+
+    if args.cmd == "record":
+        record_history(json.loads(args.path.read_text(encoding="utf-8")), args.team, args.season, args.week)
+    elif args.cmd == "list":
+        for e in store.index:
+            print(f"#{e['seq']:<4} {e['season']} wk {e['week']:<2} {e['kind']:<10} {e['taken_at']}")
+        print(f"{len(store.index)} snapshot(s), {store.size_bytes():,} bytes")
+    elif args.cmd == "week":
+        print(json.dumps(store.week(args.season, args.week), indent=2))
+    elif args.cmd == "series":
+        for point in store.player_series(args.player, args.stat, args.section):
+            print(f"{point['season']} wk {point['week']:<2} {point['value']}")
@@ -0,0 +1,161 @@
+import re
+import json
+
+# Brackets and quotes are the only characters that change JSON structure
+_STRUCTURAL = re.compile(r'[{}\[\]"]')
+# A complete JSON string on one line (JSON strings can't hold a raw newline)
+_STRING = re.compile(r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"')
+_OPENER = {"}": "{", "]": "["}
+
+
+_decode = json.JSONDecoder().raw_decode
+
+
+def _spans(text: str, i: int) -> list:
+    """Balanced bracket spans from index i on; inside brackets, whole strings are jumped over."""
+    spans, stack = [], []
+    search, match_string = _STRUCTURAL.search, _STRING.match
+    while True:
+        m = search(text, i)
+        if m is None:
+            return spans
+        pos = m.start()
+        ch = text[pos]
+        i = pos + 1
+        if ch == '"':
+            if stack:
+                s = match_string(text, pos)
+                if s is not None:
+                    i = s.end()
+        elif ch == "{" or ch == "[":
+            stack.append((ch, pos))
+        elif stack and stack[-1][0] == _OPENER[ch]:
+            spans.append((stack.pop()[1], pos + 1))
+
+
+def scan_json_values(text: str) -> list:
+    """
+    Find every top-level JSON object/array in model output in linear time.
+      - the value at the first opener is decoded straight from the text; a
+        clean or fenced document is parsed once and nothing else runs
+      - after it, one regex sweep pairs brackets; inside brackets, whole
+        strings (escapes included) are jumped over, so braces in values don't
+        count. A quote with no closing quote on its line is prose and is ignored
+      - spans are tried outermost-first; anything inside an accepted span is
+        skipped. When a span fails at some character, a nested span holding
+        that character would fail at it too and is never decoded, and nested
+        spans that end before it are known to be valid. No character is decoded
+        more than twice
+    Prose, code fences and bracketed asides that aren't JSON are ignored.
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return []
+    values, failed = [], []  # failed: (end, error position) of enclosing spans that didn't decode
+    start = min(starts)
+    try:
+        value, covered = _decode(text, start)
+        values.append(value)
+    except ValueError as e:
+        covered = start
+        failed.append((len(text), e.pos))
+
+    spans = _spans(text, covered)
+    spans.sort(key=lambda span: (span[0], -span[1]))
+    for start, end in spans:
+        if start < covered:
+            continue
+        while failed and failed[-1][0] <= start:
+            failed.pop()
+        if failed and start < failed[-1][1] < end:
+            failed.append((end, failed[-1][1]))  # would stop at the same character
+            continue
+        try:
+            value, stop = _decode(text, start)
+        except ValueError as e:
+            failed.append((end, e.pos))  # not JSON (e.g. "[see below]"); its children get a chance
+            continue
+        if stop != end:
+            failed.append((end, stop))
+            continue
+        values.append(value)
+        covered = end
+    return values
+
+
+def extract_records(text: str) -> list:
+    """
+    Model output → list of records. One object → [object]; arrays are
+    flattened; several top-level values (prose between them, NDJSON) are merged.
+    """
+    values = scan_json_values(text)
+    if not values:
+        raise ValueError("no JSON object or array found in model output")
+    if len(values) == 1:
+        return [values[0]] if isinstance(values[0], dict) else values[0]
+
+    records = []
+    for value in values:
+        if isinstance(value, dict):
+            records.append(value)
+        elif isinstance(value, list):
+            records.extend(value)
+    return records
+
+
+class RecordStream:
+    """
+    Incrementally pull records out of streamed model output.
+    feed() takes text as it arrives and returns every JSON object that
+    closed in it, either a top-level object or an element of a top-level
+    array. Fences and prose outside the JSON are skipped. Strings and escapes are
+    tracked so braces inside values don't confuse the depth count.
+    """
+
+    def __init__(self):
+        self.stack = []        # open brackets of the JSON being read
+        self.in_string = False
+        self.escape = False
+        self.capturing = False
+        self.buf = []          # text of the record currently being read
+        self.errors = 0        # captured objects that failed to parse
+
+    def _at_record_level(self) -> bool:
+        return not self.stack or self.stack == ["["]
+
+    def feed(self, text: str) -> list:
+        out = []
+        for ch in text:
+            if self.capturing:
+                self.buf.append(ch)
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch == '"':
+                # quotes in prose outside any JSON value are not strings
+                self.in_string = bool(self.stack)
+            elif ch == "{" or ch == "[":
+                if ch == "{" and not self.capturing and self._at_record_level():
+                    self.capturing = True
+                    self.buf = [ch]
+                self.stack.append(ch)
+            elif (ch == "}" or ch == "]") and self.stack:
+                self.stack.pop()
+                if self.capturing and self._at_record_level():
+                    self.capturing = False
+                    try:
+                        obj = json.loads("".join(self.buf))
+                    except ValueError:
+                        self.errors += 1
+                    else:
+                        if isinstance(obj, dict):
+                            out.append(obj)
+                    self.buf = []
+        return out
@@ -1,15 +1,18 @@
-import openai
-from openai import OpenAI
 import os
 
 endpoint = "https://cdong1--azure-proxy-web-app.modal.run"
 api_key = "supersecretkey"
 deployment_name = "gpt-4o"
 
-client = OpenAI(
-    base_url=endpoint,
-    api_key=api_key
-)
+
+def get_client():
+    """Build the OpenAI client on demand (importing openai costs more than most steps)."""
+    from openai import OpenAI
+
+    return OpenAI(
+        base_url=endpoint,
+        api_key=api_key
+    )
 
 
 
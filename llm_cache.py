@@ -0,0 +1,103 @@
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+# --- Config (env or defaults) ---
+CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", "data/llm_cache"))
+MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+MODE = os.getenv("LLM_CACHE", "on")  # on | off (bypass) | refresh (re-ask, overwrite)
+MODES = ("on", "off", "refresh")
+
+
+def cache_key(*parts) -> str:
+    """Content address for one LLM request: sha256 over the canonical JSON of its inputs."""
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent response cache, one JSON file per key under cache_dir/<2-char prefix>/.
+      - get() touches the entry so eviction is least-recently-used
+      - put() writes atomically, then evicts until the cache fits in max_bytes
+      - hit/miss/write/evict counts accumulate in cache_dir/stats.json
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = MAX_BYTES, mode: str = MODE):
+        if mode not in MODES:
+            raise ValueError(f"❌ LLM cache mode must be one of {MODES}, got {mode!r}")
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()  # chunks may hit the cache from several threads
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        if self.mode != "on":
+            return None
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # LRU: mark as recently used
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry["content"]
+
+    def put(self, key: str, content: str, **info) -> None:
+        if self.mode == "off":
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({
+            "key": key,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **info,
+            "content": content,
+        }, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+        self._count("writes")
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop least-recently-used entries until the total size fits max_bytes."""
+        entries = []
+        for p in self.cache_dir.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+            self._count("evictions")
+
+    def save_stats(self) -> dict:
+        """Fold this run's counters into the cumulative stats file and return both."""
+        stats_path = self.cache_dir / "stats.json"
+        try:
+            totals = json.loads(stats_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            totals = {}
+        for k, v in self.stats.items():
+            totals[k] = totals.get(k, 0) + v
+        if self.mode != "off":
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            stats_path.write_text(json.dumps(totals, indent=2), encoding="utf-8")
+        return {"run": dict(self.stats), "total": totals}
@@ -1,9 +1,11 @@
 import json
-import pandas as pd
+import time
+import random
+import hashlib
 from pathlib import Path
-from supabase import create_client
 import os
 from dotenv import load_dotenv
+from storage import get_storage
 
 # --- Load .env (explicit path) ---
 env_path = Path(__file__).parent / ".env"
@@ -13,44 +15,144 @@ if env_path.exists():
 else:
     print("⚠️ No .env file found, relying on shell environment variables.")
 
-# --- Config ---
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
+# --- Files ---
+DATA_DIR = Path("data")
+OUT_JSON_PATH = DATA_DIR / "records.json"
+MANIFEST_PATH = DATA_DIR / "upload_manifest.json"
 
-print("DEBUG SUPABASE_URL:", SUPABASE_URL)
-print("DEBUG SUPABASE_ANON_KEY prefix:", SUPABASE_ANON_KEY[:10] if SUPABASE_ANON_KEY else None)
+# --- Upload tuning (env or defaults) ---
+TABLE = "collected_docs"
+CHUNK_ROWS = int(os.getenv("UPLOAD_CHUNK_ROWS", "500"))
+CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+RETRIES = int(os.getenv("UPLOAD_RETRIES", "3"))
+BACKOFF = float(os.getenv("UPLOAD_BACKOFF", "1.0"))
 
-if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-    raise RuntimeError("❌ Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_ANON_KEY.")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+def record_hash(rec: dict) -> str:
+    """Content hash of one record (canonical JSON, so key order doesn't matter)."""
+    canonical = json.dumps(rec, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
-# --- Files ---
-DATA_DIR = Path("data")
-OUT_JSON_PATH = DATA_DIR / "records.json"
 
-def load_to_supabase():
+def read_manifest(target: str, path: Path = MANIFEST_PATH) -> dict:
+    """{id: content hash} of every record `target` (database:table) has confirmed."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("hashes", {}) if manifest.get("target") == target else {}
+
+
+def write_manifest(target: str, hashes: dict, path: Path = MANIFEST_PATH) -> None:
+    """Atomic replace, so a crash mid-write never leaves a half manifest."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps({"target": target, "hashes": hashes}, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+
+
+def changed_records(records: list, manifest: dict) -> list:
+    """
+    Records that are new or differ from the last confirmed upload, as (id, hash, record).
+    Duplicate ids keep the last record, as one upsert can't touch a row twice.
+    """
+    latest = {}
+    for rec in records:
+        if isinstance(rec, dict) and rec.get("id"):
+            latest[rec["id"]] = rec
+    out = []
+    for _id, rec in latest.items():
+        h = record_hash(rec)
+        if manifest.get(_id) != h:
+            out.append((_id, h, rec))
+    return out
+
+
+def chunked(items: list, max_rows: int = CHUNK_ROWS, max_bytes: int = CHUNK_BYTES):
+    """Split (id, hash, record) items into request bodies bounded by row count and JSON size."""
+    chunk, size = [], 0
+    for item in items:
+        n = len(json.dumps(item[2], ensure_ascii=False)) + 1
+        if chunk and (len(chunk) >= max_rows or size + n > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(item)
+        size += n
+    if chunk:
+        yield chunk
+
+
+def upsert_with_retry(storage, rows: list, retries: int = RETRIES, backoff: float = BACKOFF) -> None:
+    """One upsert request, retried with exponential backoff; raises after the last attempt."""
+    for attempt in range(retries + 1):
+        try:
+            storage.upsert(TABLE, rows, on_conflict="id")
+            return
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            print(f"⚠️ Upsert of {len(rows)} rows failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay + random.uniform(0, backoff))
+
+
+def load_to_supabase(full: bool = False) -> dict:
+    """
+    Upsert only records that changed since the last successful upload:
+      - data/upload_manifest.json holds the content hash of every confirmed id
+      - changed records go out in bounded chunks, each retried on failure
+      - the manifest is rewritten after each confirmed chunk, so a failed
+        run resumes where it stopped
+    full=True ignores the manifest and re-sends everything.
+    """
     if not OUT_JSON_PATH.exists():
         raise FileNotFoundError(f"❌ {OUT_JSON_PATH} not found. Run structurer.py first.")
 
-    # Load JSON
     records = json.loads(OUT_JSON_PATH.read_text(encoding="utf-8"))
     if isinstance(records, dict):
         records = [records]
 
-    # Convert to DataFrame
-    df = pd.DataFrame.from_records(records)
-    print("📊 Preview of data to insert:")
-    print(df.head())
+    storage = get_storage()
+    # The manifest belongs to one database: a different SQLite file or Supabase project starts empty
+    target = f"{storage.target}:{TABLE}"
+    manifest = {} if full else read_manifest(target)
+    confirmed = read_manifest(target) if full else dict(manifest)
+    pending = changed_records(records, manifest)
+    ids = [rec["id"] for rec in records if isinstance(rec, dict) and rec.get("id")]
+    missing_id = len(records) - len(ids)
+    duplicates = len(ids) - len(set(ids))
+    unchanged = len(set(ids)) - len(pending)
+    if missing_id:
+        print(f"⚠️ Skipping {missing_id} records without an id (upsert needs one).")
+    if duplicates:
+        print(f"⚠️ {duplicates} records repeat an earlier id; only the last of each is sent.")
+    stats = {"records": len(records), "unchanged": unchanged, "missing_id": missing_id, "duplicates": duplicates}
+    if not pending:
+        print(f"✅ Nothing to upload: all {unchanged} records with an id match the last upload to {storage.target}.")
+        return {**stats, "sent": 0, "requests": 0}
+
+    print(f"📊 {len(pending)} new/changed of {len(records)} records. First up:")
+    for _id, _, rec in pending[:3]:
+        print(f"   {_id}: {rec.get('title', '')[:60]}")
 
-    # Upsert to Supabase
-    rows = df.to_dict(orient="records")
-    res = supabase.table("collected_docs").upsert(rows, on_conflict="id").execute()
+    started = time.perf_counter()
+    sent = requests_made = 0
+    for chunk in chunked(pending):
+        upsert_with_retry(storage, [rec for _, _, rec in chunk])
+        confirmed.update((_id, h) for _id, h, _ in chunk)
+        write_manifest(target, confirmed)
+        sent += len(chunk)
+        requests_made += 1
 
-    print(f"✅ Upserted {len(rows)} rows into Supabase.")
-    if getattr(res, "error", None):
-        print("❌ Supabase error:", res.error)
+    elapsed = time.perf_counter() - started
+    print(f"✅ Upserted {sent} rows into {storage.name} in {requests_made} request(s), {elapsed:.2f}s "
+          f"({unchanged} unchanged skipped).")
+    return {**stats, "sent": sent, "requests": requests_made}
 
 if __name__ == "__main__":
-    load_to_supabase()
+    import argparse
 
+    parser = argparse.ArgumentParser(description="Upsert data/records.json into storage (changed records only).")
+    parser.add_argument("--full", action="store_true", help="ignore the manifest and re-send every record")
+    args = parser.parse_args()
+    load_to_supabase(full=args.full)
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import atexit
+import pathlib
+import threading
+
+# --- Config (env or defaults) ---
+ENABLED = os.getenv("STATS_METRICS", "0") == "1"
+METRICS_DIR = pathlib.Path(os.getenv("STATS_METRICS_DIR", "data/metrics"))
+PREFIX = "steelers_"
+FLUSH_EVENTS = 256   # buffered JSONL events before a write
+PROM_EVERY = 10.0    # seconds between Prometheus textfile rewrites in long-running processes
+
+
+class _NoopSpan:
+    """What span() returns while metrics are off: one shared object, nothing recorded."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, **fields):
+        pass
+
+
+NOOP = _NoopSpan()
+
+
+class Span:
+    """Times a `with` block; add() attaches extra fields (bytes, rows, status) to its event."""
+
+    __slots__ = ("name", "labels", "fields", "started")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+        self.fields = {}
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.started
+        if exc_type is not None:
+            self.fields["error"] = exc_type.__name__
+        _registry.observe(self.name, self.labels, seconds, self.fields)
+        return False
+
+    def add(self, **fields):
+        self.fields.update(fields)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Registry:
+    """
+    In-process totals plus a JSONL event buffer:
+      spans     (name, labels) → [count, sum seconds, max seconds]
+      counters  (name, labels) → total
+    """
+
+    def __init__(self, metrics_dir: pathlib.Path = METRICS_DIR):
+        self.dir = pathlib.Path(metrics_dir)
+        self.spans = {}
+        self.counters = {}
+        self.events = []
+        self.last_prom = time.monotonic()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one export at a time, in order
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name: str, labels: dict, seconds: float, fields: dict | None = None) -> None:
+        event = {"ts": time.time(), "pid": os.getpid(), "span": name, "seconds": round(seconds, 6),
+                 **labels, **(fields or {})}
+        with self._lock:
+            stat = self.spans.setdefault(self._key(name, labels), [0, 0.0, 0.0])
+            stat[0] += 1
+            stat[1] += seconds
+            stat[2] = max(stat[2], seconds)
+            self.events.append(event)
+            flush = len(self.events) >= FLUSH_EVENTS
+            prom = time.monotonic() - self.last_prom > PROM_EVERY
+            if prom:
+                self.last_prom = time.monotonic()  # claimed: other threads skip this rewrite
+        if flush:
+            self.write_events()
+        if prom:
+            self.write_prom()
+
+    def count(self, name: str, value: float, labels: dict) -> None:
+        with self._lock:
+            key = self._key(name, labels)
+            self.counters[key] = self.counters.get(key, 0) + value
+            self.events.append({"ts": time.time(), "pid": os.getpid(), "counter": name, "value": value, **labels})
+            flush = len(self.events) >= FLUSH_EVENTS
+        if flush:
+            self.write_events()
+
+    # --- Export ---
+    # Called from Span.__exit__: a full disk or unwritable directory costs the
+    # metrics, never the stage being measured.
+    def write_events(self, path: pathlib.Path | None = None) -> None:
+        path = path or self.dir / "events.jsonl"
+        with self._flush_lock:
+            with self._lock:
+                events, self.events = self.events, []
+            if not events:
+                return
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(e, default=str) + "\n" for e in events))
+            except OSError as e:
+                print(f"⚠️ Dropped {len(events)} metric event(s): can't write {path} ({e})")
+
+    def prometheus(self) -> str:
+        """Totals in the Prometheus text format (spans as summaries plus a _max gauge)."""
+        def fmt(name, labels, value):
+            inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+            return f"{PREFIX}{name}{{{inner}}} {value}" if inner else f"{PREFIX}{name} {value}"
+
+        lines = []
+        with self._lock:
+            spans, counters = dict(self.spans), dict(self.counters)
+        for name in sorted({n for n, _ in spans}):
+            lines.append(f"# TYPE {PREFIX}{name}_seconds summary")
+            for (n, labels), (cnt, total, _) in sorted(spans.items()):
+                if n == name:
+                    lines.append(fmt(f"{name}_seconds_count", labels, cnt))
+                    lines.append(fmt(f"{name}_seconds_sum", labels, f"{total:.6f}"))
+            lines.append(f"# TYPE {PREFIX}{name}_seconds_max gauge")
+            for (n, labels), (_, _, mx) in sorted(spans.items()):
+                if n == name:
+                    lines.append(fmt(f"{name}_seconds_max", labels, f"{mx:.6f}"))
+        for name in sorted({n for n, _ in counters}):
+            lines.append(f"# TYPE {PREFIX}{name}_total counter")
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(fmt(f"{name}_total", labels, value))
+        return "\n".join(lines) + "\n"
+
+    def write_prom(self, path: pathlib.Path | None = None) -> None:
+        """Rewrite the textfile atomically (node_exporter's textfile collector reads it)."""
+        path = path or self.dir / "steelers.prom"
+        tmp = path.with_suffix(f".prom.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._flush_lock:
+            with self._lock:
+                self.last_prom = time.monotonic()
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp.write_text(self.prometheus(), encoding="utf-8")
+                tmp.replace(path)
+            except OSError as e:
+                print(f"⚠️ Can't write metrics to {path} ({e})")
+                if tmp.is_file():
+                    tmp.unlink()
+
+    def flush(self) -> None:
+        self.write_events()
+        if self.spans or self.counters:
+            self.write_prom()
+
+
+_registry = Registry()
+
+
+# --- Instrumentation API (near-free while disabled) ---
+def span(name: str, **labels):
+    """with span("fetch", team="pit") as s: ...; s.add(bytes=n)"""
+    return Span(name, labels) if ENABLED else NOOP
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    if ENABLED:
+        _registry.count(name, value, labels)
+
+
+def observe(name: str, seconds: float, fields: dict | None = None, **labels) -> None:
+    """A duration the caller timed itself, for work a `with` block can't wrap (e.g. a generator)."""
+    if ENABLED:
+        _registry.observe(name, labels, seconds, fields)
+
+
+def enable(metrics_dir: pathlib.Path | None = None) -> Registry:
+    """Turn recording on for this process (same as STATS_METRICS=1)."""
+    global ENABLED, _registry
+    if metrics_dir is not None:
+        _registry.flush()
+        _registry = Registry(metrics_dir)
+    ENABLED = True
+    return _registry
+
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+    _registry.flush()
+
+
+def flush() -> None:
+    _registry.flush()
+
+
+atexit.register(lambda: ENABLED and _registry.flush())
+
+
+# --- Report over recorded events ---
+def summarize(path: pathlib.Path, by: str | None = None, since: float | None = None) -> tuple[list, dict]:
+    """
+    Per span (optionally split by one label): count, total, mean, p50, p95, max
+    seconds, sorted by total time; and counter totals.
+    """
+    times, counters = {}, {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            e = json.loads(line)
+            if since and e["ts"] < since:
+                continue
+            if "span" in e:
+                key = e["span"] if by is None else f"{e['span']}[{e.get(by, '')}]"
+                times.setdefault(key, []).append(e["seconds"])
+            else:
+                key = e["counter"] if by is None else f"{e['counter']}[{e.get(by, '')}]"
+                counters[key] = counters.get(key, 0) + e["value"]
+    rows = []
+    for key, values in times.items():
+        values.sort()
+        rows.append({"span": key, "count": len(values), "total": sum(values), "mean": sum(values) / len(values),
+                     "p50": values[len(values) // 2], "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+                     "max": values[-1]})
+    return sorted(rows, key=lambda r: r["total"], reverse=True), counters
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Where pipeline time goes, from recorded metrics (STATS_METRICS=1).")
+    parser.add_argument("path", nargs="?", type=pathlib.Path, default=METRICS_DIR / "events.jsonl")
+    parser.add_argument("--by", help="split spans and counters by this label (e.g. team, table, section)")
+    parser.add_argument("--hours", type=float, help="only events from the last N hours")
+    args = parser.parse_args()
+
+    if not args.path.exists():
+        raise SystemExit(f"❌ {args.path} not found. Run a stage with STATS_METRICS=1 first.")
+    rows, counters = summarize(args.path, args.by, time.time() - args.hours * 3600 if args.hours else None)
+    print(f"{'span':<36} {'count':>7} {'total s':>9} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for r in rows:
+        print(f"{r['span']:<36} {r['count']:>7} {r['total']:>9.2f} {r['mean'] * 1000:>9.1f} "
+              f"{r['p50'] * 1000:>9.1f} {r['p95'] * 1000:>9.1f} {r['max'] * 1000:>9.1f}")
+    if counters:
+        print()
+        for name, value in sorted(counters.items()):
+            print(f"{name:<36} {value:>14,.0f}")
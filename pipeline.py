@@ -0,0 +1,268 @@
+import os
+import json
+import time
+import hashlib
+import pathlib
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import metrics
+
+DATA_DIR = pathlib.Path("data")
+STATE_PATH = DATA_DIR / "pipeline_state.json"
+STATS_JSON = DATA_DIR / "steelers_stats.json"
+RAW_BLOB = DATA_DIR / "raw_blob.txt"
+RECORDS_JSON = DATA_DIR / "records.json"
+
+# --- Config (env or defaults) ---
+TEAM = os.getenv("PIPELINE_TEAM", "pit")
+# collect has no local inputs: it re-fetches at most once per this many seconds
+COLLECT_TTL = float(os.getenv("PIPELINE_COLLECT_TTL", "900"))
+WORKERS = int(os.getenv("PIPELINE_WORKERS", "4"))
+
+
+# --- Content hashes ---
+def file_hash(path: pathlib.Path, cache: dict) -> str | None:
+    """
+    sha256 of a file, or None if it doesn't exist. `cache` maps path →
+    [size, mtime_ns, sha256]; a file whose size and mtime match is not re-read,
+    which is what keeps a no-change refresh in the milliseconds.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    key = str(path)
+    hit = cache.get(key)
+    if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+        return hit[2]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    cache[key] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+    return cache[key][2]
+
+
+class Stage:
+    """
+    One pipeline step: run() reads `inputs` and writes `outputs` (files under data/).
+    `params` returns anything else the result depends on (e.g. the storage target).
+    A stage with no inputs (the network fetch) is re-run once its result is `ttl` seconds old.
+    """
+
+    def __init__(self, name: str, run, inputs=(), outputs=(), params=None, ttl: float | None = None):
+        self.name = name
+        self.run = run
+        self.inputs = [pathlib.Path(p) for p in inputs]
+        self.outputs = [pathlib.Path(p) for p in outputs]
+        self.params = params or (lambda: "")
+        self.ttl = ttl
+
+
+class Pipeline:
+    """
+    Stages as a DAG: a stage depends on whichever stage produces one of its inputs.
+    Like make, a stage is skipped when its input/output hashes and params match
+    the last successful run recorded in `state_path`, or when an input file
+    doesn't exist (nothing to do yet, e.g. no raw blob); independent stages run
+    in parallel. State is saved after every stage, so an interrupted refresh
+    keeps what already finished.
+    """
+
+    def __init__(self, stages: list[Stage], state_path: pathlib.Path = STATE_PATH, workers: int = WORKERS):
+        self.stages = {s.name: s for s in stages}
+        producers = {str(p): s.name for s in stages for p in s.outputs}
+        self.deps = {s.name: sorted({producers[str(p)] for p in s.inputs if str(p) in producers} - {s.name})
+                     for s in stages}
+        self.state_path = pathlib.Path(state_path)
+        self.workers = max(1, workers)
+        self.state = (json.loads(self.state_path.read_text(encoding="utf-8"))
+                      if self.state_path.exists() else {"stages": {}, "files": {}})
+        self._lock = threading.Lock()
+
+    def closure(self, targets: list[str]) -> list[str]:
+        """`targets` plus everything upstream of them, in dependency order."""
+        order, seen = [], set()
+
+        def visit(name):
+            if name in seen:
+                return
+            seen.add(name)
+            for dep in self.deps[name]:
+                visit(dep)
+            order.append(name)
+
+        for name in targets:
+            if name not in self.stages:
+                raise ValueError(f"❌ Unknown stage {name!r} (have: {', '.join(self.stages)})")
+            visit(name)
+        return order
+
+    def _hashes(self, paths: list[pathlib.Path]) -> dict:
+        with self._lock:
+            return {str(p): file_hash(p, self.state["files"]) for p in paths}
+
+    def stale_reason(self, stage: Stage) -> str | None:
+        """Why `stage` must run, or None when it is up to date."""
+        last = self.state["stages"].get(stage.name)
+        if last is None:
+            return "never run"
+        if last.get("params") != stage.params():
+            return "params changed"
+        if last.get("inputs") != self._hashes(stage.inputs):
+            return "inputs changed"
+        outputs = self._hashes(stage.outputs)
+        if None in outputs.values() or last.get("outputs") != outputs:
+            return "outputs missing or modified"
+        if stage.ttl is not None and time.time() - last.get("finished", 0) > stage.ttl:
+            return f"older than {stage.ttl:.0f}s"
+        return None
+
+    def save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_suffix(f".json.{threading.get_ident()}.tmp")
+        with self._lock:
+            tmp.write_text(json.dumps(self.state, indent=1), encoding="utf-8")
+            tmp.replace(self.state_path)
+
+    def _run_stage(self, stage: Stage) -> dict:
+        inputs = self._hashes(stage.inputs)
+        params = stage.params()
+        started = time.perf_counter()
+        with metrics.span("stage", stage=stage.name):
+            stage.run()
+        entry = {"inputs": inputs, "outputs": self._hashes(stage.outputs), "params": params,
+                 "finished": time.time(), "seconds": round(time.perf_counter() - started, 3),
+                 "ran_at": datetime.now(timezone.utc).isoformat()}
+        with self._lock:
+            self.state["stages"][stage.name] = entry
+        self.save_state()
+        return entry
+
+    def run(self, targets: list[str] | None = None, force: bool = False, dry_run: bool = False) -> dict:
+        """
+        Bring `targets` (default: every stage) up to date.
+        Returns {stage: "ran" | "skipped" | "no input" | "failed" | "blocked" | "would run"}.
+        """
+        todo = self.closure(targets or list(self.stages))
+        forced = set(targets or self.stages) if force else set()
+        status = {}
+
+        def start(pool, name):
+            stage = self.stages[name]
+            missing = [str(p) for p in stage.inputs if not p.exists()]
+            if missing:
+                status[name] = "no input"
+                print(f"⏭️  {name}: no input ({', '.join(missing)} not found)")
+                return None
+            reason = "forced" if name in forced else self.stale_reason(stage)
+            if reason is None:
+                status[name] = "skipped"
+                print(f"⏭️  {name}: up to date")
+                return None
+            if dry_run:
+                status[name] = "would run"
+                print(f"🔜 {name}: would run ({reason})")
+                return None
+            print(f"▶️  {name}: running ({reason})")
+            return pool.submit(self._run_stage, stage)
+
+        started = time.perf_counter()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while len(status) < len(todo):
+                for name in todo:
+                    if name in status or name in running.values():
+                        continue
+                    deps = [status.get(d) for d in self.deps[name] if d in todo]
+                    if any(d in ("failed", "blocked") for d in deps):
+                        status[name] = "blocked"
+                        print(f"⛔ {name}: skipped, an upstream stage failed")
+                    elif "would run" in deps:
+                        status[name] = "would run"
+                        print(f"🔜 {name}: would run if upstream output changes")
+                    elif all(d is not None for d in deps):
+                        fut = start(pool, name)
+                        if fut is not None:
+                            running[fut] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    try:
+                        entry = fut.result()
+                        status[name] = "ran"
+                        print(f"✅ {name}: done in {entry['seconds']:.2f}s")
+                    except (Exception, SystemExit) as e:
+                        status[name] = "failed"
+                        print(f"❌ {name}: {e}")
+
+        elapsed = time.perf_counter() - started
+        ran = sum(s == "ran" for s in status.values())
+        idle = sum(s == "no input" for s in status.values())
+        print(f"🏁 {ran} stage(s) ran, {sum(s == 'skipped' for s in status.values())} up to date"
+              f"{f', {idle} without input' if idle else ''} in {elapsed * 1000:.1f} ms")
+        return status
+
+
+# --- The Steelers pipeline: collect → upload, structure → load ---
+def _collect():
+    from collector import TEAM_URL, collect_stats
+    collect_stats(TEAM_URL.format(slug=TEAM))
+
+
+def _structure():
+    from structurer import structure_blob
+    structure_blob()
+
+
+def _load():
+    from loaderscript import load_to_supabase
+    load_to_supabase()
+
+
+def _upload():
+    from storage import get_storage
+    from upload_json import insert_stats
+    insert_stats(json.loads(STATS_JSON.read_text(encoding="utf-8")), get_storage(), TEAM)
+
+
+def _storage_target() -> str:
+    # Read from the env rather than opening the backend, so checking it stays cheap
+    backend = os.getenv("STATS_BACKEND", "supabase")
+    if backend == "sqlite":
+        return f"sqlite:{os.getenv('STATS_SQLITE_PATH', 'data/steelers.db')}"
+    return f"{backend}:{os.getenv('SUPABASE_URL', '')}"
+
+
+def default_stages() -> list[Stage]:
+    return [
+        Stage("collect", _collect, outputs=[STATS_JSON], params=lambda: TEAM, ttl=COLLECT_TTL),
+        Stage("structure", _structure, inputs=[RAW_BLOB], outputs=[RECORDS_JSON]),
+        Stage("load", _load, inputs=[RECORDS_JSON], params=_storage_target),
+        Stage("upload", _upload, inputs=[STATS_JSON], params=_storage_target),
+    ]
+
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    stage_names = [s.name for s in default_stages()]
+    parser = argparse.ArgumentParser(description="Refresh the stats pipeline, skipping stages whose inputs are unchanged.")
+    parser.add_argument("targets", nargs="*", metavar="stage",
+                        help=f"stages to bring up to date, with their upstream ({', '.join(stage_names)}; default: all)")
+    parser.add_argument("--force", action="store_true", help="re-run the named stages (or all) even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only report which stages would run")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="stages run in parallel")
+    args = parser.parse_args()
+    unknown = [t for t in args.targets if t not in stage_names]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    status = Pipeline(default_stages(), workers=args.workers).run(args.targets or None, args.force, args.dry_run)
+    if "failed" in status.values():
+        raise SystemExit(1)
@@ -0,0 +1,159 @@
+import re
+
+# Reserved id for the team "Total" row, so it joins like any player and can be dropped by name
+TOTAL_ID = 0
+TOTAL_NAME = "Total"
+NAME_HEADERS = ("Player", "Name")
+# ESPN's names cell is the player link and a position span, which the extractor
+# joins without a space ("T.J. WattLB"); longest code first where they overlap
+POSITIONS = ("QB", "RB", "FB", "WR", "TE", "OT", "OG", "OL", "C", "G", "T", "DE", "DT", "NT", "DL",
+             "ILB", "OLB", "MLB", "LB", "CB", "SS", "FS", "DB", "S", "PK", "K", "P", "LS")
+_POSITION = re.compile(r"^(.*?\S)\s*(?:" + "|".join(POSITIONS) + r")$")
+
+
+def split_position(cell: str) -> tuple[str, str | None]:
+    """A names cell → (player name, position or None)."""
+    cell = cell.strip()
+    m = _POSITION.match(cell)
+    return (m.group(1), cell[len(m.group(1)):].strip()) if m else (cell, None)
+
+
+def player_key(name: str, team: str) -> str:
+    """What a player id is keyed on: team and the name without its position."""
+    return f"{team}:{name}"
+
+
+class PlayerRegistry:
+    """
+    Stable integer ids for players, kept in the storage `players` table:
+      - keyed on team + name (player_key), so same-name players on two teams
+        get two ids and a position change keeps the id; `name` is the bare
+        display name
+      - seeded from that table, so every run, machine and fresh checkout
+        (the Modal job too) sees the same ids
+      - a new player gets max(id) + 1; ids are never reused; 0 is the team Total row
+      - sync() inserts only the new players. Plain inserts, so a second writer
+        that allocated the same id (or key) fails on the key instead of
+        overwriting; run it before the stats rows that reference them
+    Rows from before keys (key null) keep their ids for the stats that point
+    at them but are not matched again.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        rows = storage.select("players", "id,name,key")
+        self.by_key = {row["key"]: row["id"] for row in rows if row["key"] and row["id"] != TOTAL_ID}
+        self.by_id = {row["id"]: row["name"] for row in rows if row["id"] != TOTAL_ID}
+        self.next_id = max([TOTAL_ID, *(row["id"] for row in rows)]) + 1
+        self.new = [] if any(row["id"] == TOTAL_ID for row in rows) else [{"id": TOTAL_ID, "name": TOTAL_NAME}]
+
+    def id_for(self, name: str | None, team: str) -> int | None:
+        if not name:
+            return None
+        name = split_position(name)[0]
+        if name == TOTAL_NAME:
+            return TOTAL_ID
+        key = player_key(name, team)
+        pid = self.by_key.get(key)
+        if pid is None:
+            pid = self.by_key[key] = self.next_id
+            self.by_id[pid] = name
+            self.next_id += 1
+            self.new.append({"id": pid, "name": name, "key": key})
+        return pid
+
+    def names(self) -> dict:
+        """{id: name}, including the Total row."""
+        return {TOTAL_ID: TOTAL_NAME, **self.by_id}
+
+    def sync(self) -> None:
+        """Insert players given ids since the last sync into the storage `players` table."""
+        if self.new:
+            self.storage.insert("players", self.new)
+            self.new = []
+
+
+def player_fields(name: str | None, ids: list | None, i: int) -> dict:
+    """
+    A stats row's player columns: with player ids the name text is dropped
+    (it lives once in the players table) and only rows without an id keep it.
+    """
+    if not ids:
+        return {"player": name}
+    pid = ids[i] if i < len(ids) else None
+    return {"player": name if pid is None else None, "player_id": pid}
+
+
+def row_player_ids(stats_data: dict, registry: PlayerRegistry, team: str) -> dict:
+    """
+    {table_name: [player id per row]} for one team's scraped page. ESPN puts names and
+    stats in separate tables, so each stats row takes the id of the name at the
+    same position in its paired names table. This is the only place that
+    positional alignment happens; everything downstream joins on the id.
+    """
+    from sections import PAIR_MAP
+
+    ids = {}
+    for table_name, table in stats_data.items():
+        ids[table_name] = [registry.id_for(next((row[h] for h in NAME_HEADERS if row.get(h)), None), team)
+                           for row in table.get("rows", [])]
+    for names_tbl, stats_tbl in PAIR_MAP:
+        if names_tbl in ids and stats_tbl in stats_data:
+            name_ids = ids[names_tbl]
+            n = len(stats_data[stats_tbl].get("rows", []))
+            own = ids[stats_tbl]
+            ids[stats_tbl] = [own[i] if own[i] is not None else (name_ids[i] if i < len(name_ids) else None)
+                              for i in range(n)]
+    return ids
+
+
+class PlayerIndex:
+    """
+    player id → {category: row positions} over a frame of stored rows
+    (category + player_id columns), built once with a single groupby.
+    profile() is then a dict lookup per category instead of a string filter.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        self.locations = {}
+        if not self.frame.empty and "player_id" in self.frame:
+            groups = self.frame.dropna(subset=["player_id"]).groupby(["player_id", "category"], sort=False).indices
+            for (pid, category), positions in groups.items():
+                self.locations.setdefault(int(pid), {})[category] = positions
+
+    def rows(self, player_id: int) -> dict:
+        return self.locations.get(player_id, {})
+
+    def profile(self, player_id: int) -> dict:
+        """{category: that player's stored rows}."""
+        return {cat: self.frame.iloc[pos] for cat, pos in self.rows(player_id).items()}
+
+
+if __name__ == "__main__":
+    import argparse
+    import pandas as pd
+    from sections import to_list
+    from storage import get_storage
+
+    parser = argparse.ArgumentParser(description="Player registry and cross-category profile lookup.")
+    parser.add_argument("name", nargs="?", help="player name (prefix match) to profile")
+    args = parser.parse_args()
+
+    storage = get_storage()
+    registry = PlayerRegistry(storage)
+    print(f"👥 {len(registry.by_id)} players in {storage.name}")
+    if args.name:
+        matches = [(n, pid) for pid, n in registry.by_id.items() if n.startswith(args.name)]
+        if not matches:
+            raise SystemExit(f"❌ No player matching {args.name!r} in {storage.name}")
+        index = PlayerIndex(pd.DataFrame(storage.select("steelers_stats", "category,player_id,stat_key,stat_value")))
+        for name, pid in matches:
+            print(f"--- {name} (#{pid}) ---")
+            for category, rows in index.profile(pid).items():
+                for _, rec in rows.iterrows():
+                    if str(rec["stat_key"]).startswith("["):  # upload_json rows: one JSON array per row
+                        pairs = zip(to_list(rec["stat_key"]), to_list(rec["stat_value"]))
+                    else:  # one stat per row
+                        pairs = [(rec["stat_key"], rec["stat_value"])]
+                    print(f"{category}: " + ", ".join(f"{k}={v}" for k, v in pairs))
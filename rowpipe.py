@@ -0,0 +1,258 @@
+import os
+import json
+import pathlib
+from urllib.parse import urlsplit
+import metrics
+from table_extractor import iter_tables
+from stat_schema import NAME_HEADERS, parse_value, schema_for
+
+DATA_DIR = pathlib.Path("data")
+NDJSON_PATH = DATA_DIR / "rows.ndjson"
+
+# --- Config (env or defaults) ---
+READ_CHUNK = int(os.getenv("ROWPIPE_READ_CHUNK", str(64 * 1024)))  # chars of HTML fed to the parser at a time
+DROP_COLUMNS = {"LNG"}
+
+
+# --- Sources: HTML in pieces, one page at a time ---
+def iter_url(url: str, limiter=None):
+    """
+    (team, chunks) for a live page, read off the socket in READ_CHUNK pieces.
+    Fetched like the collector's pages: rate limit, retries (Retry-After) and fetch metrics.
+    """
+    from archive import archive_response, team_for
+    from collector import fetch_with_retry
+
+    r = fetch_with_retry(url, limiter, stream=True)
+    r.encoding = r.encoding or "utf-8"
+    if os.getenv("STATS_ARCHIVE", "1") == "1":
+        archive_response(r)  # reads the body once; chunks below come from it
+        metrics.count("bytes_downloaded", len(r.content), host=urlsplit(url).netloc)
+        text = r.text
+        return team_for(url), (text[i:i + READ_CHUNK] for i in range(0, len(text), READ_CHUNK))
+    return team_for(url), r.iter_content(READ_CHUNK, decode_unicode=True)
+
+
+def iter_file(path: pathlib.Path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while chunk := f.read(READ_CHUNK):
+            yield chunk
+
+
+def team_pages(teams: list[str]):
+    """Live pages for each team slug, fetched one after another at the collector's host rate."""
+    from collector import HOST_RATE, TEAM_URL, HostRateLimiter
+
+    limiter = HostRateLimiter(HOST_RATE)
+    for slug in teams:
+        yield iter_url(TEAM_URL.format(slug=slug), limiter)
+
+
+def saved_pages(source: pathlib.Path, season: int | None = None):
+    """(team, chunks) for every page in a directory or tarball (see backfill.py)."""
+    from backfill import list_pages, page_tag, read_pages
+    from collector import NFL_TEAMS
+
+    teams = set(NFL_TEAMS)
+    tags = {name: page_tag(name, teams, season or 0) for name in list_pages(source)}
+    if source.is_dir():
+        for name, tag in tags.items():
+            if tag:
+                yield tag[0], iter_file(source / name)
+        return
+    for name, body in read_pages(source, {n for n, t in tags.items() if t}):
+        yield tags[name][0], [body.decode("utf-8", errors="replace")]
+
+
+def archived_pages(teams: list[str] | None = None):
+    """(team, chunks) for each team's newest archived page (see archive.py)."""
+    import gzip
+    from archive import PageArchive
+
+    archive = PageArchive()
+    latest = {e["team"]: e for e in archive.entries() if not teams or e["team"] in teams}
+    for team, entry in latest.items():
+        with gzip.open(archive.object_path(entry["sha"]), "rt", encoding="utf-8", errors="replace") as f:
+            yield team, iter(lambda: f.read(READ_CHUNK), "")
+
+
+# --- Rows ---
+def extract_rows(pages):
+    """
+    {"team", "category", "row", "player", <stat>: value, ...} for every table
+    row of every page, yielded as each table closes in the page stream.
+    """
+    for team, chunks in pages:
+        for category, table in iter_tables(chunks):
+            for idx, row in enumerate(table["rows"]):
+                yield {"team": team, "category": category, "row": idx,
+                       "player": next((row[h] for h in NAME_HEADERS if row.get(h)), None), **row}
+
+
+# --- Transform stages (generator in, generator out) ---
+def drop_columns(rows, columns=DROP_COLUMNS):
+    for row in rows:
+        for col in columns:
+            row.pop(col, None)
+        yield row
+
+
+def type_values(rows):
+    """Stat cells to their declared types (see stat_schema); names stay text."""
+    keys = {"team", "category", "row", "player", *NAME_HEADERS}
+    for row in rows:
+        types = schema_for(row["category"]) or {}
+        for k, v in row.items():
+            if k not in keys:
+                row[k] = parse_value(v, types.get(k))
+        yield row
+
+
+def key_rows(rows, registry=None):
+    """
+    Add a stable "key" (team:category:row) and, with a PlayerRegistry, "player_id".
+    Stats tables take the id of the same position in their names table, which
+    always comes just before them, so only one names list is held at a time.
+    """
+    from sections import PAIR_MAP
+
+    stats_of = {names_tbl: stats_tbl for names_tbl, stats_tbl in PAIR_MAP}
+    names_ids, names_for = [], None
+    for row in rows:
+        row["key"] = f"{row['team']}:{row['category']}:{row['row']}"
+        if registry is not None:
+            if row["player"] is not None:
+                row["player_id"] = registry.id_for(row["player"], row["team"])
+                if row["category"] in stats_of:
+                    if row["row"] == 0:
+                        names_ids, names_for = [], (row["team"], row["category"])
+                    names_ids.append(row["player_id"])
+            elif names_for and stats_of.get(names_for[1]) == row["category"] and row["team"] == names_for[0]:
+                row["player_id"] = names_ids[row["row"]] if row["row"] < len(names_ids) else None
+        yield row
+
+
+def kv_row(row: dict) -> dict:
+    """A steelers_stats row, shaped like upload_json writes them."""
+    cells = {k: v for k, v in row.items() if k not in ("team", "category", "row", "player", "key", "player_id")}
+    out = {"category": row["category"], "player": row["player"],
+           "stat_key": json.dumps(list(cells)), "stat_value": json.dumps(list(cells.values()))}
+    if "player_id" in row:  # the name lives in the players table
+        out["player_id"] = row["player_id"]
+        if row["player_id"] is not None:
+            out["player"] = None
+    return out
+
+
+# --- Sinks ---
+class NDJSONSink:
+    """One JSON object per line, written as rows arrive."""
+
+    def __init__(self, path: pathlib.Path = NDJSON_PATH):
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.rows = 0
+
+    def write(self, row: dict) -> None:
+        self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.rows += 1
+
+    def close(self) -> dict:
+        self.file.close()
+        print(f"✅ Wrote {self.rows} rows to {self.path}")
+        return {"path": str(self.path), "rows": self.rows}
+
+
+class StorageSink:
+    """
+    Rows → `shape` → BulkWriter (chunked inserts, bounded requests in flight).
+    With a PlayerRegistry, players new since the last chunk are stored just
+    before each chunk is sent, so no stored row points at an unknown id.
+    """
+
+    def __init__(self, storage, table: str = "steelers_stats", shape=kv_row, registry=None):
+        from bulk_writer import BulkWriter
+
+        self.shape = shape
+        self.registry = registry
+        self.writer = BulkWriter(storage, table)
+        self.pending = 0
+
+    def write(self, row: dict) -> None:
+        self.pending += 1
+        if self.registry is not None and self.pending >= self.writer.chunk_size:
+            self.registry.sync()  # this add sends the chunk
+            self.pending = 0
+        self.writer.add(self.shape(row))
+
+    def close(self) -> dict:
+        if self.registry is not None:
+            self.registry.sync()
+        return self.writer.close()
+
+
+def run(rows, sinks: list) -> int:
+    """Drain `rows` into every sink, one row at a time. Returns the row count."""
+    n = 0
+    try:
+        for row in rows:
+            for sink in sinks:
+                sink.write(row)
+            n += 1
+    finally:
+        for sink in sinks:
+            sink.close()
+    return n
+
+
+def pipeline(pages, registry=None, drop=DROP_COLUMNS, typed: bool = True):
+    """extract → drop → type → key, all lazy."""
+    rows = drop_columns(extract_rows(pages), drop)
+    if typed:
+        rows = type_values(rows)
+    return key_rows(rows, registry)
+
+
+if __name__ == "__main__":
+    import argparse
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Stream table rows from pages into storage and NDJSON.")
+    src = parser.add_mutually_exclusive_group()
+    src.add_argument("--teams", help="comma-separated team slugs to fetch (default: pit)")
+    src.add_argument("--all-teams", action="store_true", help="fetch all 32 teams")
+    src.add_argument("--from", dest="source", type=pathlib.Path, help="directory or tarball of saved pages")
+    parser.add_argument("--archive", action="store_true",
+                        help="each team's newest archived page instead of fetching (no network; --teams filters)")
+    parser.add_argument("--ndjson", type=pathlib.Path, default=NDJSON_PATH, help="NDJSON output file")
+    parser.add_argument("--no-storage", action="store_true", help="only write the NDJSON file")
+    parser.add_argument("--drop", default=",".join(sorted(DROP_COLUMNS)), help="columns to drop (comma-separated)")
+    parser.add_argument("--raw", action="store_true", help="keep cells as scraped text")
+    args = parser.parse_args()
+
+    from collector import NFL_TEAMS
+    from players import PlayerRegistry
+
+    if args.source:
+        pages = saved_pages(args.source)
+    elif args.archive and args.all_teams:
+        pages = archived_pages()
+    elif args.archive:
+        pages = archived_pages([t.strip().lower() for t in args.teams.split(",")] if args.teams else None)
+    else:
+        pages = team_pages(NFL_TEAMS if args.all_teams else
+                           [t.strip().lower() for t in (args.teams or "pit").split(",") if t.strip()])
+
+    sinks = [NDJSONSink(args.ndjson)]
+    registry = None
+    if not args.no_storage:
+        load_dotenv()
+        from storage import get_storage
+        storage = get_storage()
+        registry = PlayerRegistry(storage) if storage.player_ids else None
+        sinks.append(StorageSink(storage, registry=registry))
+
+    drop = {c.strip() for c in args.drop.split(",") if c.strip()}
+    n = run(pipeline(pages, registry, drop, not args.raw), sinks)
+    print(f"🏁 Streamed {n} rows")
@@ -0,0 +1,262 @@
+import json
+import numpy as np
+import pandas as pd
+from stat_schema import INT, FLOAT, PAIR_MAP, parse_column, schema_for
+
+MISSING_PLAYER = ("None", "")
+SECTION_COLUMNS = "player,stat_key,stat_value"
+
+
+def to_list(x):
+    """Parse Supabase JSON/text column into a Python list."""
+    if isinstance(x, list):
+        return x
+    if isinstance(x, str):
+        try:
+            return json.loads(x)
+        except Exception:
+            # fallback: split by comma if a plain string somehow
+            return [p.strip() for p in x.split(",")]
+    return []
+
+
+def parse_lists(values: pd.Series) -> list:
+    """
+    Parse a whole column of JSON-encoded lists with a single json.loads call.
+    Falls back to per-item to_list() when the column isn't clean JSON text.
+    """
+    if len(values) and pd.api.types.infer_dtype(values, skipna=False) == "string":
+        try:
+            parsed = json.loads("[" + ",".join(values.tolist()) + "]")
+            if len(parsed) == len(values) and all(type(v) is list for v in parsed):
+                return parsed
+        except ValueError:
+            pass
+    return [to_list(v) for v in values]
+
+
+def expand_kv(df_cat: pd.DataFrame) -> pd.DataFrame:
+    """
+    Expand each Supabase row where stat_key/stat_value are arrays
+    into a flat dict (one row per player/stat record).
+    Rows sharing a stat_key layout are built as one block, so the work per
+    record is a list lookup instead of a dict + Series per row.
+    """
+    if df_cat.empty:
+        return pd.DataFrame()
+    n = len(df_cat)
+
+    keys_col = df_cat["stat_key"] if "stat_key" in df_cat else pd.Series([None] * n)
+    vals_col = df_cat["stat_value"] if "stat_value" in df_cat else pd.Series([None] * n)
+    player = df_cat["player"].reset_index(drop=True) if "player" in df_cat else pd.Series([None] * n)
+    valid_player = player.notna() & ~player.isin(MISSING_PLAYER)
+
+    # stat_key repeats per category: parse each distinct layout once
+    try:
+        codes, layouts = pd.factorize(keys_col, use_na_sentinel=False)
+        layouts = [to_list(k) for k in layouts]
+    except TypeError:  # unhashable (already-decoded lists)
+        key_lists = [to_list(k) for k in keys_col]
+        codes, uniq = pd.factorize(pd.Series([json.dumps(k) for k in key_lists]))
+        layouts = [json.loads(k) for k in uniq]
+    values = parse_lists(vals_col)
+
+    blocks = []
+    for code, keys in enumerate(layouts):
+        idx = (codes == code).nonzero()[0]
+        if not len(idx):
+            continue
+        # dict(zip(keys, vals)): first-seen key order, last value wins, extra values dropped
+        rows = [values[i] for i in idx]
+        width = min(len(keys), max(map(len, rows)))
+        if any(len(r) > width for r in rows):
+            rows = [r[:width] for r in rows]
+        last_pos = {k: i for i, k in enumerate(keys[:width])}
+
+        block = pd.DataFrame(rows, index=idx, columns=range(width))
+        block = block[list(last_pos.values())]
+        block.columns = list(last_pos)
+
+        block_valid = valid_player.iloc[idx]
+        if "player" not in last_pos and block_valid.any():
+            block["player"] = player.iloc[idx].where(block_valid).to_numpy()
+        blocks.append(block)
+
+    if len(blocks) == 1:
+        return blocks[0].reset_index(drop=True)
+    return pd.concat(blocks).sort_index().reset_index(drop=True)
+
+
+def names_from(names_df: pd.DataFrame) -> list:
+    """Get a name list from an expanded names table."""
+    if names_df.empty:
+        return []
+    if "player" in names_df.columns and not names_df["player"].isna().all():
+        return names_df["player"].astype(str).tolist()
+    if "Name" in names_df.columns:
+        return names_df["Name"].astype(str).tolist()
+    return []
+
+
+def coerce_numeric(stats_df: pd.DataFrame, types: dict | None = None) -> pd.DataFrame:
+    """
+    Convert every all-numeric column (keep player as string); a column with
+    any non-numeric value is left untouched. Rows written since typed ingest
+    (stat_schema) hold numbers already, so clean columns take a single C-level
+    float cast; only columns with gaps fall back to pd.to_numeric, and only
+    older text rows in a declared numeric column get parsed (once, vectorized).
+    """
+    types = types or {}
+    out = stats_df.copy()
+    for col in stats_df.columns:
+        if col == "player":
+            continue
+        raw = stats_df[col].to_numpy(dtype=object)
+        try:
+            nums = raw.astype(np.float64)
+        except (TypeError, ValueError):
+            if types.get(col) in (INT, FLOAT):
+                nums = parse_column(pd.Series(raw), types[col]).to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                nums = pd.to_numeric(pd.Series(raw), errors="coerce").to_numpy(dtype=np.float64)
+                if (np.isnan(nums) & pd.notna(raw)).any():
+                    continue
+        if len(nums) and not np.isnan(nums).any() and (nums % 1 == 0).all():
+            out[col] = nums.astype(np.int64)
+        else:
+            out[col] = nums
+    return out
+
+
+def finish_section(stats_df: pd.DataFrame, names_list: list) -> pd.DataFrame:
+    """Attach player names by position, drop 'Total' and duplicates."""
+    # Align lengths
+    if names_list:
+        names_list = names_list[: len(stats_df)]
+        if len(names_list) < len(stats_df):
+            names_list += [None] * (len(stats_df) - len(names_list))
+        stats_df.insert(0, "player", names_list)
+    else:
+        # If no names at all, keep whatever is there (likely None)
+        if "player" not in stats_df.columns:
+            stats_df.insert(0, "player", [None] * len(stats_df))
+
+    # Drop team total unless you want it
+    stats_df = stats_df[stats_df["player"] != "Total"]
+
+    # Deduplicate (some sites repeat the set)
+    return stats_df.drop_duplicates()
+
+
+def snapshot_section(frame: pd.DataFrame, headers: dict, names_table: str, stats_table: str) -> pd.DataFrame:
+    """
+    The same table as build_section, from the typed snapshot (see snapshot.py):
+    stat columns are stored numeric, so nothing is decoded or parsed here.
+    """
+    from snapshot import table_frame
+
+    stats_df = table_frame(frame, stats_table, headers.get(stats_table, []))
+    if stats_df.empty:
+        return pd.DataFrame()
+    names_df = table_frame(frame, names_table, headers.get(names_table, []))
+    names = names_df.iloc[:, 0].astype(object) if not names_df.empty else None
+    names_list = names.where(names.notna(), None).tolist() if names is not None else []
+    return finish_section(stats_df, names_list)
+
+
+def has_player_ids(stats_src: pd.DataFrame) -> bool:
+    """True when every stats row carries a player_id (see players.py)."""
+    return "player_id" in stats_src and not stats_src.empty and stats_src["player_id"].notna().all()
+
+
+def build_section(names_src: pd.DataFrame, stats_src: pd.DataFrame, players: dict | None = None,
+                  category: str | None = None) -> pd.DataFrame:
+    """
+    Reconstruct a clean table from Supabase key/value rows of the stats
+    table `category` (default: the rows' own category column):
+      - player names come from the `players` {id: name} map when every stats
+        row has a player_id; otherwise from names_src ("Name" or 'player'), aligned by index
+      - drop 'Total' and duplicate records *before* expanding (on the raw
+        player/stat_key/stat_value text, so repeated sets are never parsed)
+      - expand stats in bulk and convert numeric columns in one pass, text
+        cells of the table's declared numeric columns parsed by stat_schema
+    """
+    if stats_src.empty:
+        return pd.DataFrame()
+    stats_src = stats_src.reset_index(drop=True)
+    n = len(stats_src)
+
+    if players is not None and has_player_ids(stats_src):
+        names = stats_src["player_id"].astype("int64").map(players).astype(object)
+        names = names.where(names.notna(), None)
+    else:
+        names_list = names_from(expand_kv(names_src))
+        names = pd.Series((names_list[:n] + [None] * (n - len(names_list))), dtype=object) if names_list else None
+    records = stats_src.drop(columns=["player", "player_id"] if names is not None else ["player_id"], errors="ignore")
+
+    raw = pd.DataFrame({
+        "player": names if names is not None else records.get("player", pd.Series([None] * n)),
+        "stat_key": records.get("stat_key", pd.Series([None] * n)).astype(str),
+        "stat_value": records.get("stat_value", pd.Series([None] * n)).astype(str),
+    })
+    keep = raw[raw["player"].ne("Total")].drop_duplicates().index
+
+    stats_df = expand_kv(records.loc[keep])
+    if names is not None:
+        stats_df.insert(0, "player", names.loc[keep].to_numpy())
+    elif "player" not in stats_df.columns:
+        stats_df.insert(0, "player", [None] * len(stats_df))
+    stats_df = stats_df[stats_df["player"] != "Total"]
+
+    if category is None and "category" in stats_src:
+        category = stats_src["category"].iloc[0]
+    return coerce_numeric(stats_df, schema_for(category) if category else None)
+
+
+# --- Dashboard reads from storage ---
+def fetch_category(store, category: str) -> pd.DataFrame:
+    """Only one category's rows and only the columns a section needs."""
+    columns = SECTION_COLUMNS + (",player_id" if store.player_ids else "")
+    rows = store.select("steelers_stats", columns, where={"category": category})
+    return pd.DataFrame(rows, columns=columns.split(","))
+
+
+def storage_section(store, names_table: str, stats_table: str, players: dict | None = None) -> pd.DataFrame:
+    """
+    A section rebuilt from storage rows. Rows with player ids join names from
+    `players` ({id: name}); only older rows without ids need the names table
+    fetched and aligned by position.
+    """
+    stats_src = fetch_category(store, stats_table)
+    if stats_src.empty:
+        return pd.DataFrame()
+    if players is not None and has_player_ids(stats_src):
+        return build_section(pd.DataFrame(), stats_src, players, stats_table)
+    return build_section(fetch_category(store, names_table), stats_src, category=stats_table)
+
+
+def best_chart_column(label: str, columns: list[str]) -> str | None:
+    if label.startswith("Passing") and "YDS" in columns: return "YDS"
+    if label.startswith("Rushing") and "CAR" in columns: return "CAR"
+    if label.startswith("Receiving") and "REC" in columns: return "REC"
+    # General fallbacks
+    for cand in ("YDS", "TD", "GP"):
+        if cand in columns: return cand
+    return None
+
+
+def chart_series(label: str, section: pd.DataFrame) -> pd.Series | None:
+    """Bar-chart series for a section (player → best column), or None."""
+    col = best_chart_column(label, list(section.columns))
+    if not col or section.empty:
+        return None
+    try:
+        chart_df = section[["player", col]].copy()
+        if not pd.api.types.is_numeric_dtype(chart_df[col]):
+            chart_df[col] = pd.to_numeric(chart_df[col], errors="coerce")
+        # Remove NaN & keep players with a name
+        chart_df = chart_df.dropna(subset=[col])
+        chart_df = chart_df[chart_df["player"].notna()]
+        return chart_df.set_index("player")[col] if not chart_df.empty else None
+    except Exception:
+        return None
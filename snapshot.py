@@ -0,0 +1,137 @@
+import json
+import pathlib
+import pandas as pd
+from stat_schema import column_kind, parse_column
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # only needed for reading/writing snapshots
+    pa = None
+    feather = None
+
+DATA_DIR = pathlib.Path("data")
+SNAPSHOT_PATH = DATA_DIR / "steelers_stats.arrow"
+
+NAME_HEADERS = ("Player", "Name")
+KEY_COLUMNS = ["category", "row", "player"]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("❌ pyarrow is required for columnar snapshots (pip install pyarrow).")
+
+
+def parse_stat_column(values: pd.Series, kind: str | None = None) -> pd.Series:
+    """
+    Vectorized text → number for one stat column (see stat_schema.parse_column):
+      "1,234" → 1234, "75t" (LNG touchdown marker) → 75, "--"/"" → null.
+    Undeclared columns with any value that isn't numeric stay as strings.
+    """
+    return parse_column(values, kind)
+
+
+def tables_to_frame(stats_data: dict) -> tuple[pd.DataFrame, dict]:
+    """
+    Flatten {"table_N": {"headers", "rows"}} into one typed frame:
+    category/row/player keys + one column per stat header, each parsed once
+    to the type stat_schema declares for it.
+    Returns (frame, headers_by_table).
+    """
+    records = []
+    headers_by_table = {}
+    for table_name, table in stats_data.items():
+        headers = table.get("headers", [])
+        headers_by_table[table_name] = headers
+        for idx, row in enumerate(table.get("rows", [])):
+            rec = {k: v for k, v in row.items() if k not in NAME_HEADERS}
+            rec["category"] = table_name
+            rec["row"] = idx
+            rec["player"] = row.get("Player") or row.get("Name")
+            records.append(rec)
+
+    frame = pd.DataFrame.from_records(records)
+    if frame.empty:
+        frame = pd.DataFrame(columns=KEY_COLUMNS)
+
+    frame["category"] = frame["category"].astype("category")
+    frame["row"] = frame["row"].astype("int32")
+    frame["player"] = frame["player"].astype("category")
+    for col in frame.columns:
+        if col not in KEY_COLUMNS:
+            frame[col] = parse_stat_column(frame[col], column_kind(col, headers_by_table))
+
+    stat_cols = [c for c in frame.columns if c not in KEY_COLUMNS]
+    return frame[KEY_COLUMNS + stat_cols], headers_by_table
+
+
+def write_snapshot(stats_data: dict, path: pathlib.Path = SNAPSHOT_PATH,
+                   compression: str = "zstd") -> pathlib.Path:
+    """
+    Write scraped tables as an Arrow IPC (Feather v2) file: typed stat columns,
+    dictionary-encoded category/player, compressed buffers.
+    Use compression="uncompressed" for fully zero-copy memory-mapped reads.
+    """
+    _require_pyarrow()
+    frame, headers_by_table = tables_to_frame(stats_data)
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"steelers.headers"] = json.dumps(headers_by_table).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    feather.write_feather(table, tmp, compression=compression)
+    tmp.replace(path)
+    return path
+
+
+def read_snapshot_table(path: pathlib.Path = SNAPSHOT_PATH, columns: list[str] | None = None):
+    """Memory-map the snapshot and return the Arrow table (optionally projected)."""
+    _require_pyarrow()
+    with pa.memory_map(str(path), "r") as source:
+        return feather.read_table(source, columns=columns, memory_map=True)
+
+
+def read_snapshot(path: pathlib.Path = SNAPSHOT_PATH, columns: list[str] | None = None) -> pd.DataFrame:
+    """Load the snapshot straight into pandas (categoricals + native numeric dtypes)."""
+    return read_snapshot_table(path, columns).to_pandas()
+
+
+def read_headers(path: pathlib.Path = SNAPSHOT_PATH) -> dict:
+    """Original per-table header order, kept in the file's schema metadata."""
+    table = read_snapshot_table(path, columns=["category"])
+    raw = (table.schema.metadata or {}).get(b"steelers.headers", b"{}")
+    return json.loads(raw)
+
+
+def table_frame(frame: pd.DataFrame, table_name: str, headers: list[str]) -> pd.DataFrame:
+    """One scraped table back out of the snapshot frame, columns in original header order."""
+    part = frame[frame["category"] == table_name].sort_values("row")
+    cols = {}
+    for h in headers:
+        if h in NAME_HEADERS:
+            cols[h] = part["player"].astype(object)
+        elif h in part.columns:
+            cols[h] = part[h]
+    return pd.DataFrame(cols).reset_index(drop=True)
+
+
+def table_rows(frame: pd.DataFrame, table_name: str, headers: list[str]) -> list[dict]:
+    """Rows of one table as plain dicts of native Python values (nulls → None)."""
+    part = table_frame(frame, table_name, headers).astype(object)
+    return part.where(part.notna(), None).to_dict(orient="records")
+
+
+if __name__ == "__main__":
+    import sys
+
+    src = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_DIR / "steelers_stats.json"
+    if not src.exists():
+        raise SystemExit(f"❌ {src} not found. Run collector.py first.")
+
+    stats = json.loads(src.read_text(encoding="utf-8"))
+    out = write_snapshot(stats)
+    print(f"✅ Wrote {out} ({out.stat().st_size:,} bytes) from {src} ({src.stat().st_size:,} bytes)")
@@ -0,0 +1,166 @@
+import metrics
+
+# Map ESPN tables → friendly names
+TABLE_MAP = {
+    "table_0": "passing_names",
+    "table_1": "passing_stats",
+    "table_2": "rushing_names",
+    "table_3": "rushing_stats",
+    "table_4": "receiving_names",
+    "table_5": "receiving_stats",
+    "table_6": "defense_names",
+    "table_7": "defense_stats",
+    "table_8": "scoring_names",
+    "table_9": "scoring_stats",
+    "table_10": "kick_names",
+    "table_11": "kick_stats",
+    "table_12": "fg_names",
+    "table_13": "fg_stats",
+    "table_14": "punting_names",
+    "table_15": "punting_stats",
+}
+
+# Pair names-table with stats-table (re-exported by sections)
+PAIR_MAP = {
+    ("table_0", "table_1"): "Passing Stats",
+    ("table_2", "table_3"): "Rushing Stats",
+    ("table_4", "table_5"): "Receiving Stats",
+    ("table_6", "table_7"): "Defense Stats",
+    ("table_8", "table_9"): "Scoring Stats",
+    ("table_10", "table_11"): "Kicking Stats",
+    ("table_12", "table_13"): "Field Goal Stats",
+    ("table_14", "table_15"): "Punting Stats",
+}
+
+# --- Stat types ---
+INT, FLOAT, TEXT = "int", "float", "text"
+NAME_HEADERS = ("Player", "Name")
+NULL_TOKENS = {"", "--", "-"}
+
+# Stats table → declared type per column. Counts, yards and LNG ("75t" is a
+# long touchdown) are ints; averages, rates and percentages are floats.
+# Columns not listed here are inferred from their values.
+STAT_TYPES = {
+    "table_1": {  # Passing Stats
+        "GP": INT, "CMP": INT, "ATT": INT, "CMP%": FLOAT, "YDS": INT, "AVG": FLOAT, "YDS/G": FLOAT,
+        "LNG": INT, "TD": INT, "INT": INT, "SACK": INT, "SYL": INT, "RTG": FLOAT,
+    },
+    "table_3": {  # Rushing Stats
+        "GP": INT, "CAR": INT, "YDS": INT, "AVG": FLOAT, "LNG": INT, "BIG": INT, "TD": INT,
+        "YDS/G": FLOAT, "FUM": INT, "LST": INT, "FD": INT,
+    },
+    "table_5": {  # Receiving Stats
+        "GP": INT, "REC": INT, "TGTS": INT, "YDS": INT, "AVG": FLOAT, "TD": INT, "LNG": INT,
+        "BIG": INT, "YDS/G": FLOAT, "FUM": INT, "LST": INT, "YAC": INT, "FD": INT,
+    },
+    "table_7": {  # Defense Stats (half sacks make SACK a float)
+        "GP": INT, "SOLO": INT, "AST": INT, "TOT": INT, "SACK": FLOAT, "SCKYDS": INT, "TFL": INT,
+        "PD": INT, "INT": INT, "YDS": INT, "LNG": INT, "TD": INT, "FF": INT, "FR": INT, "FTD": INT, "KB": INT,
+    },
+    "table_9": {  # Scoring Stats
+        "GP": INT, "PASS": INT, "RUSH": INT, "REC": INT, "RET": INT, "TD": INT, "2PT": INT,
+        "PAT": INT, "FG": INT, "PTS": INT,
+    },
+    "table_11": {  # Kicking Stats
+        "GP": INT, "FGM": INT, "FGA": INT, "FG%": FLOAT, "LNG": INT, "XPM": INT, "XPA": INT,
+        "XP%": FLOAT, "PTS": INT,
+    },
+    "table_13": {  # Field Goal Stats (kick/punt returns)
+        "GP": INT, "ATT": INT, "YDS": INT, "AVG": FLOAT, "LNG": INT, "TD": INT, "FC": INT,
+    },
+    "table_15": {  # Punting Stats
+        "GP": INT, "PUNTS": INT, "YDS": INT, "LNG": INT, "AVG": FLOAT, "NET": FLOAT, "PBLK": INT,
+        "IN20": INT, "TB": INT, "FC": INT, "ATT": INT,
+    },
+}
+
+
+# Every name a stats table goes by: raw ("table_1"), friendly ("passing_stats"), label ("Passing Stats")
+SCHEMAS = {
+    **STAT_TYPES,
+    **{friendly: STAT_TYPES[raw] for raw, friendly in TABLE_MAP.items() if raw in STAT_TYPES},
+    **{label: STAT_TYPES[stats_tbl] for (_, stats_tbl), label in PAIR_MAP.items() if stats_tbl in STAT_TYPES},
+}
+
+
+def schema_for(category: str) -> dict | None:
+    """Declared column types of a stats table by any of its names; None for names and unknown tables."""
+    return SCHEMAS.get(category)
+
+
+def column_kind(column: str, categories) -> str | None:
+    """One type for a column shared by several tables: FLOAT wins over INT; None if undeclared."""
+    kinds = {STAT_TYPES[c][column] for c in categories if column in STAT_TYPES.get(c, {})}
+    if not kinds:
+        return None
+    return FLOAT if FLOAT in kinds else kinds.pop()
+
+
+# --- Scalar: one value at a time (row-at-a-time ingest) ---
+def parse_value(value, kind: str | None = None):
+    """
+    One ESPN cell → its declared type: "1,234" → 1234, "75t" → 75, "--" → None.
+    Values that are already numbers pass through. With no declared type the
+    cell becomes a number where it is one and stays text otherwise; a declared
+    numeric cell that isn't a number becomes None (and is counted).
+    """
+    if not isinstance(value, str) or kind == TEXT:
+        return value
+    text = value.strip()
+    if text in NULL_TOKENS:
+        return None
+    cleaned = text.replace(",", "").removesuffix("t")
+    if kind != FLOAT:
+        try:
+            return int(cleaned)
+        except ValueError:
+            pass
+    try:
+        return float(cleaned)
+    except ValueError:
+        if kind is None:
+            return text
+        metrics.count("stat_parse_errors")
+        return None
+
+
+def typed_row(category: str, row: dict) -> dict:
+    """A scraped row with its stat cells parsed once; rows of names/unknown tables come back as-is."""
+    types = schema_for(category)
+    if types is None:
+        return row
+    return {k: v if k in NAME_HEADERS else parse_value(v, types.get(k)) for k, v in row.items()}
+
+
+# --- Vectorized: whole columns (snapshot and dashboard) ---
+def parse_column(values, kind: str | None = None):
+    """
+    Vectorized parse_value for a pandas Series. INT → Int32/Int64 (nullable;
+    float64 if any value is fractional), FLOAT → float64, TEXT → string.
+    Numeric columns are only cast. With no declared type, columns with any
+    value that isn't numeric stay as strings.
+    """
+    import pandas as pd
+
+    if kind == TEXT:
+        return values.astype("string")
+    if pd.api.types.is_numeric_dtype(values.dtype) or (
+            len(values) and pd.api.types.infer_dtype(values, skipna=True) in ("integer", "floating", "mixed-integer-float")):
+        nums = pd.to_numeric(values, errors="coerce")
+    else:
+        text = values.astype("string").str.strip()
+        text = text.mask(text.isin(NULL_TOKENS))
+        cleaned = text.str.replace(",", "", regex=False).str.removesuffix("t")
+        nums = pd.to_numeric(cleaned, errors="coerce")
+        bad = int((nums.isna() & text.notna()).sum())
+        if bad and kind is None:
+            return text
+        if bad:
+            metrics.count("stat_parse_errors", bad)
+    if kind == FLOAT:
+        return nums.astype("float64")
+    finite = nums.dropna()
+    if finite.mod(1).eq(0).all():
+        small = finite.empty or finite.abs().max() < 2**31
+        return nums.astype("Int32" if small else "Int64")
+    return nums.astype("float64")
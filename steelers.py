@@ -0,0 +1,119 @@
+import os
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+# Subcommand → (module whose __main__ runs it, help). Nothing here is imported
+# until its subcommand runs, so `steelers collect` never loads pandas or openai.
+COMMANDS = {
+    "collect": ("collector", "scrape ESPN team stats tables (data/steelers_stats.json)"),
+    "structure": ("structurer", "structure data/raw_blob.txt into records with the LLM"),
+    "load": ("loaderscript", "upsert changed data/records.json records into collected_docs"),
+    "upload": ("upload_json", "scrape and insert key/value rows into steelers_stats"),
+    "stream": ("rowpipe", "stream table rows from pages into storage and NDJSON in bounded memory"),
+    "pipeline": ("pipeline", "refresh only the stages whose inputs changed (collect, structure, load, upload)"),
+    "backfill": ("backfill", "rebuild team stats and history from a directory or tarball of saved pages"),
+    "export": ("export", "copy steelers_stats into a local compressed Arrow file (parallel keyset reads)"),
+    "archive": ("archive", "archived raw pages: list, stats, and replay without the network"),
+    "history": ("history", "week-by-week stats history"),
+    "players": ("players", "player registry and profiles"),
+    "metrics": ("metrics", "where time goes: span/counter report from STATS_METRICS=1 runs"),
+    "bench": ("benchmarks", "benchmarks for the pipeline hot paths"),
+}
+APP_PATH = Path(__file__).parent / "streamlit_app.py"
+
+
+def run_module(module: str, argv: list[str]) -> None:
+    """Run `module` as if it were `python module.py argv...`."""
+    import runpy
+
+    sys.argv = [f"{module}.py", *argv]
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+
+
+def serve(argv: list[str]) -> int:
+    cmd = [sys.executable, "-m", "streamlit", "run", str(APP_PATH), *argv]
+    return subprocess.call(cmd)
+
+
+def import_times(module: str) -> tuple[int, list[tuple[int, str]]]:
+    """
+    `python -X importtime -c "import module"` in a fresh interpreter.
+    Returns (total µs for the module, [(cumulative µs, name)] of what it imports directly).
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(Path(__file__).parent),
+                                                                     os.getenv("PYTHONPATH")]))}
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         capture_output=True, text=True, env=env)
+    if res.returncode != 0:
+        raise RuntimeError(res.stderr.strip().splitlines()[-1] if res.stderr.strip() else f"import {module} failed")
+
+    entries = []
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, int(cumulative), name.strip()))
+
+    # The module is the last top-level entry; its direct imports are the depth-1
+    # entries since the previous top-level one
+    total, children = 0, []
+    for depth, cumulative, name in reversed(entries):
+        if depth == 0 and name == module and not total:
+            total = cumulative
+        elif depth == 0 and total:
+            break
+        elif depth == 1 and total:
+            children.append((cumulative, name))
+    return total, sorted(children, reverse=True)
+
+
+def import_report(commands: list[str], top: int = 5) -> None:
+    """Print import cost per subcommand and its heaviest direct imports."""
+    modules = [("steelers", "(cli)")] + [(COMMANDS[c][0], c) for c in commands]
+    for module, command in modules:
+        try:
+            total, children = import_times(module)
+        except RuntimeError as e:
+            print(f"{command:>10}  {module:<14} ❌ {e}")
+            continue
+        heavy = ", ".join(f"{name} {us / 1000:.0f}ms" for us, name in children[:top])
+        print(f"{command:>10}  {module:<14} {total / 1000:8.1f} ms   {heavy}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    helps = {**{c: h for c, (_, h) in COMMANDS.items()},
+             "serve": "run the Streamlit dashboard (extra args go to streamlit run)",
+             "imports": "import-time report per subcommand (python -X importtime)"}
+    parser = argparse.ArgumentParser(
+        prog="steelers",
+        description="Steelers stats pipeline. Arguments after the subcommand go to that stage "
+                    "(e.g. steelers collect --teams pit,cle).",
+        epilog="commands:\n" + "\n".join(f"  {c:<10} {h}" for c, h in helps.items()),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("command", choices=list(helps), metavar="command")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        return serve(args.args)
+    if args.command == "imports":
+        sub = argparse.ArgumentParser(prog="steelers imports")
+        sub.add_argument("commands", nargs="*", help=f"subcommands to measure (default: all of {', '.join(COMMANDS)})")
+        sub.add_argument("--top", type=int, default=5, help="heaviest direct imports to list")
+        opts = sub.parse_args(args.args)
+        unknown = [c for c in opts.commands if c not in COMMANDS]
+        if unknown:
+            sub.error(f"unknown subcommand(s): {', '.join(unknown)}")
+        import_report(opts.commands or list(COMMANDS), opts.top)
+        return 0
+
+    run_module(COMMANDS[args.command][0], args.args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
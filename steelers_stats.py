@@ -1,50 +1,58 @@
 import json
 import pathlib
-import os
-from supabase import create_client
+from bulk_writer import BulkWriter
+from storage import get_storage
+from players import PlayerRegistry, player_fields, row_player_ids
+from stat_schema import TABLE_MAP, typed_row
 
 DATA_DIR = pathlib.Path("data")
 JSON_PATH = DATA_DIR / "steelers_stats.json"
+SNAPSHOT_PATH = DATA_DIR / "steelers_stats.arrow"
+TEAM = "pit"  # whose page steelers_stats.json holds; player ids are keyed by team
+
+def load_stats() -> tuple[dict, str] | tuple[None, None]:
+    """Prefer the typed columnar snapshot; fall back to the JSON tables."""
+    if SNAPSHOT_PATH.exists():
+        try:
+            from snapshot import read_headers, read_snapshot, table_rows
+            frame = read_snapshot(SNAPSHOT_PATH)
+            headers_by_table = read_headers(SNAPSHOT_PATH)
+            stats = {
+                name: {"headers": headers, "rows": table_rows(frame, name, headers)}
+                for name, headers in headers_by_table.items()
+            }
+            return stats, "snapshot"
+        except (ImportError, RuntimeError) as e:
+            print(f"⚠️ Can't read {SNAPSHOT_PATH} ({e}); falling back to JSON.")
 
-# Initialize Supabase connection
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY")
-
-supabase = None
-if SUPABASE_URL and SUPABASE_ANON_KEY:
-    supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-else:
-    print("⚠️ Missing SUPABASE_URL or SUPABASE_ANON_KEY in environment.")
-
-# Map ESPN tables → friendly names
-TABLE_MAP = {
-    "table_0": "passing_names",
-    "table_1": "passing_stats",
-    "table_2": "rushing_names",
-    "table_3": "rushing_stats",
-    "table_4": "receiving_names",
-    "table_5": "receiving_stats",
-    "table_6": "defense_names",
-    "table_7": "defense_stats",
-    "table_8": "scoring_names",
-    "table_9": "scoring_stats",
-    "table_10": "kick_names",
-    "table_11": "kick_stats",
-    "table_12": "fg_names",
-    "table_13": "fg_stats",
-    "table_14": "punting_names",
-    "table_15": "punting_stats",
-}
+    if not JSON_PATH.exists():
+        return None, None
+
+    with open(JSON_PATH, "r", encoding="utf-8") as f:
+        return json.load(f), "JSON"
 
 def print_stats():
-    if not JSON_PATH.exists():
+    stats, source = load_stats()
+    if stats is None:
         print(f"❌ File not found: {JSON_PATH}")
         return
 
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        stats = json.load(f)
+    print(f"📊 Steelers 2025 Stats (from {source})\n")
+
+    # Buffer rows and insert in chunks if a storage backend is available
+    try:
+        storage = get_storage()
+        writer = BulkWriter(storage)
+    except RuntimeError as e:
+        print(f"⚠️ {e} Printing only.")
+        writer = None
 
-    print("📊 Steelers 2025 Stats (from JSON)\n")
+    # Stats tables have no name column; player ids come from the paired names table
+    player_ids = {}
+    if writer and storage.player_ids:
+        registry = PlayerRegistry(storage)
+        player_ids = row_player_ids(stats, registry, TEAM)
+        registry.sync()
 
     for table_name, table in stats.items():
         headers = table.get("headers", [])
@@ -56,22 +64,25 @@ def print_stats():
         print(" | ".join(headers))
 
         for row in rows[:5]:  # print only first 5 rows
-            print(" | ".join(row.get(h, "") for h in headers))
+            print(" | ".join("" if row.get(h) is None else str(row[h]) for h in headers))
 
         print()
 
-        # Insert into Supabase if client is available
-        if supabase:
-            for row in rows:
-                player = row.get("Player") or row.get("Name")
-                for key, value in row.items():
+        if writer:
+            ids = player_ids.get(table_name)
+            for i, row in enumerate(rows):
+                player = player_fields(row.get("Player") or row.get("Name"), ids, i)
+                for key, value in typed_row(table_name, row).items():
                     if key not in ["Player", "Name"]:
-                        supabase.table("steelers_stats").insert({
+                        writer.add({
                             "category": friendly_name,
-                            "player": player,
+                            **player,
                             "stat_key": key,
-                            "stat_value": value
-                        }).execute()
+                            "stat_value": value,
+                        })
+
+    if writer:
+        writer.close()
 
 if __name__ == "__main__":
     print_stats()
@@ -0,0 +1,293 @@
+import os
+import abc
+import json
+import sqlite3
+import threading
+from pathlib import Path
+import metrics
+
+# --- Config (env or defaults) ---
+# STATS_BACKEND (supabase | sqlite | export) is read by get_storage() at call time,
+# so a .env loaded after import still applies
+SQLITE_PATH = Path("data/steelers.db")
+# PostgREST caps responses (1000 rows by default), so Supabase reads are paged
+PAGE_SIZE = int(os.getenv("STATS_PAGE_SIZE", "1000"))
+
+# Local mirror of the Supabase tables
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS steelers_stats (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category TEXT,
+    player TEXT,
+    stat_key TEXT,
+    stat_value TEXT,
+    player_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS steelers_stats_category_player ON steelers_stats (category, player);
+CREATE INDEX IF NOT EXISTS steelers_stats_category_id ON steelers_stats (category, id);
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    key TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS players_key ON players (key);
+CREATE TABLE IF NOT EXISTS collected_docs (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    summary TEXT,
+    source_url TEXT,
+    extracted_at TEXT
+);
+"""
+
+
+def _request(storage, op: str, table: str, rows: list | None = None):
+    """Span for one storage request; rows written are counted per backend and table."""
+    if rows:
+        metrics.count("rows_written", len(rows), backend=storage.name, table=table)
+    return metrics.span("storage_request", backend=storage.name, op=op, table=table)
+
+
+class Storage(abc.ABC):
+    """
+    What the pipeline needs from a database:
+      - insert(): bulk write of plain dict rows
+      - upsert(): insert-or-update on a key column
+      - select(): filtered read (equality filters, ordered), every matching row;
+        after/upto limit it to ids in (after, upto] for keyset reads
+      - id_range(): (min id, max id, row count), optionally of ids <= upto
+      - version(): cheap change marker for caching reads
+    player_ids says whether steelers_stats rows carry a player_id column
+    (and a players table exists) for id joins; see players.py.
+    target names the database itself (backend plus path or URL), for
+    bookkeeping of what was written where.
+    """
+
+    name = "storage"
+    player_ids = True
+
+    @property
+    def target(self) -> str:
+        return self.name
+
+    @abc.abstractmethod
+    def insert(self, table: str, rows: list) -> None:
+        ...
+
+    @abc.abstractmethod
+    def upsert(self, table: str, rows: list, on_conflict: str = "id") -> None:
+        ...
+
+    @abc.abstractmethod
+    def select(self, table: str, columns: str = "*", where: dict | None = None,
+               order: str = "id", limit: int | None = None, after: int | None = None,
+               upto: int | None = None) -> list:
+        ...
+
+    @abc.abstractmethod
+    def id_range(self, table: str = "steelers_stats", upto: int | None = None) -> tuple:
+        ...
+
+    @abc.abstractmethod
+    def version(self, table: str = "steelers_stats") -> str:
+        ...
+
+
+class SupabaseStorage(Storage):
+    """Storage over the Supabase REST API (one request per call, reads paged)."""
+
+    name = "supabase"
+    # Needs the migration: alter table steelers_stats add column player_id bigint;
+    # create table players (id bigint primary key, name text, key text unique);
+    # (a players table from before keys: add column key text unique, drop name's unique constraint)
+    player_ids = os.getenv("STATS_PLAYER_IDS", "0") == "1"
+
+    def __init__(self, url: str | None = None, key: str | None = None, page_size: int = PAGE_SIZE):
+        from supabase import create_client
+
+        url = url or os.getenv("SUPABASE_URL")
+        key = key or os.getenv("SUPABASE_ANON_KEY")
+        if not url or not key:
+            raise RuntimeError("❌ Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_ANON_KEY.")
+        self.client = create_client(url, key)
+        self.url = url
+        self.page_size = page_size
+
+    @property
+    def target(self) -> str:
+        return f"{self.name}:{self.url}"
+
+    @staticmethod
+    def _check(res):
+        if getattr(res, "error", None):
+            raise RuntimeError(f"❌ Supabase error: {res.error}")
+        return res
+
+    def insert(self, table: str, rows: list) -> None:
+        with _request(self, "insert", table, rows):
+            self._check(self.client.table(table).insert(rows).execute())
+
+    def upsert(self, table: str, rows: list, on_conflict: str = "id") -> None:
+        with _request(self, "upsert", table, rows):
+            self._check(self.client.table(table).upsert(rows, on_conflict=on_conflict).execute())
+
+    def select(self, table: str, columns: str = "*", where: dict | None = None,
+               order: str = "id", limit: int | None = None, after: int | None = None,
+               upto: int | None = None) -> list:
+        rows, start = [], 0
+        while True:
+            size = self.page_size if limit is None else min(self.page_size, limit - len(rows))
+            query = self.client.table(table).select(columns)
+            for col, value in (where or {}).items():
+                query = query.eq(col, value)
+            if after is not None:
+                query = query.gt("id", after)
+            if upto is not None:
+                query = query.lte("id", upto)
+            with _request(self, "select", table) as s:
+                res = self._check(query.order(order).range(start, start + size - 1).execute())
+                s.add(rows=len(res.data or []))
+            page = res.data or []
+            rows.extend(page)
+            if len(page) < size or (limit is not None and len(rows) >= limit):
+                return rows
+            start += size
+
+    def version(self, table: str = "steelers_stats") -> str:
+        with _request(self, "version", table):
+            res = self._check(
+                self.client.table(table).select("id", count="exact").order("id", desc=True).limit(1).execute()
+            )
+        newest = res.data[0]["id"] if res.data else None
+        return f"supabase:{res.count}:{newest}"
+
+    def id_range(self, table: str = "steelers_stats", upto: int | None = None) -> tuple:
+        ends = []
+        for desc in (False, True):
+            query = self.client.table(table).select("id", count="exact")
+            if upto is not None:
+                query = query.lte("id", upto)
+            with _request(self, "id_range", table):
+                res = self._check(query.order("id", desc=desc).limit(1).execute())
+            ends.append(res.data[0]["id"] if res.data else None)
+        return ends[0], ends[1], res.count or 0
+
+
+class SQLiteStorage(Storage):
+    """
+    Embedded local database with the same tables as Supabase:
+      - WAL journal, so dashboard reads never block the loader
+      - one connection per thread (BulkWriter and Streamlit both use threads)
+      - inserts are one executemany per chunk inside a single transaction
+      - (category, player) and (category, id) indexes for section reads,
+        (player_id, category) for player profiles
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path = SQLITE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(steelers_stats)")}
+        if cols and "player_id" not in cols:  # database from before player ids
+            conn.execute("ALTER TABLE steelers_stats ADD COLUMN player_id INTEGER")
+        player_cols = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+        if player_cols and "key" not in player_cols:  # players keyed by raw name cell: names may repeat now
+            conn.execute("ALTER TABLE players ADD COLUMN key TEXT")
+            conn.execute("DROP INDEX IF EXISTS players_name")
+        conn.executescript(SCHEMA)
+        conn.execute("CREATE INDEX IF NOT EXISTS steelers_stats_player_id ON steelers_stats (player_id, category)")
+
+    @property
+    def target(self) -> str:
+        return f"{self.name}:{self.path.resolve()}"
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _groups(rows: list) -> dict:
+        """Rows grouped by column set, values ready to bind (lists/dicts stored as JSON)."""
+        groups = {}
+        for row in rows:
+            cols = tuple(row)
+            groups.setdefault(cols, []).append(tuple(
+                json.dumps(v) if isinstance(v, (list, dict)) else v for v in row.values()
+            ))
+        return groups
+
+    def _write(self, table: str, rows: list, conflict: str = "") -> None:
+        conn = self._conn()
+        with conn:
+            for cols, params in self._groups(rows).items():
+                names = ", ".join(f'"{c}"' for c in cols)
+                marks = ", ".join("?" * len(cols))
+                tail = conflict and conflict.format(
+                    updates=", ".join(f'"{c}" = excluded."{c}"' for c in cols) or "id = id"
+                )
+                conn.executemany(f'INSERT INTO "{table}" ({names}) VALUES ({marks}) {tail}', params)
+
+    def insert(self, table: str, rows: list) -> None:
+        with _request(self, "insert", table, rows):
+            self._write(table, rows)
+
+    def upsert(self, table: str, rows: list, on_conflict: str = "id") -> None:
+        with _request(self, "upsert", table, rows):
+            self._write(table, rows, f'ON CONFLICT ("{on_conflict}") DO UPDATE SET {{updates}}')
+
+    def select(self, table: str, columns: str = "*", where: dict | None = None,
+               order: str = "id", limit: int | None = None, after: int | None = None,
+               upto: int | None = None) -> list:
+        cols = "*" if columns.strip() == "*" else ", ".join(f'"{c.strip()}"' for c in columns.split(","))
+        sql = f'SELECT {cols} FROM "{table}"'
+        where = where or {}
+        clauses = [f'"{c}" = ?' for c in where]
+        params = list(where.values())
+        if after is not None:
+            clauses.append("id > ?")
+            params.append(after)
+        if upto is not None:
+            clauses.append("id <= ?")
+            params.append(upto)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f' ORDER BY "{order}"'
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with _request(self, "select", table) as s:
+            cur = self._conn().execute(sql, params)
+            names = [d[0] for d in cur.description]
+            rows = [dict(zip(names, row)) for row in cur.fetchall()]
+            s.add(rows=len(rows))
+        return rows
+
+    def version(self, table: str = "steelers_stats") -> str:
+        with _request(self, "version", table):
+            count, newest = self._conn().execute(f'SELECT count(*), max(id) FROM "{table}"').fetchone()
+        return f"sqlite:{count}:{newest}"
+
+    def id_range(self, table: str = "steelers_stats", upto: int | None = None) -> tuple:
+        sql = f'SELECT min(id), max(id), count(*) FROM "{table}"' + (" WHERE id <= ?" if upto is not None else "")
+        with _request(self, "id_range", table):
+            return self._conn().execute(sql, () if upto is None else (upto,)).fetchone()
+
+
+def get_storage(backend: str | None = None) -> Storage:
+    """Storage for STATS_BACKEND (or `backend`); RuntimeError if it can't be set up."""
+    backend = backend or os.getenv("STATS_BACKEND", "supabase")
+    if backend == "sqlite":
+        return SQLiteStorage(Path(os.getenv("STATS_SQLITE_PATH", SQLITE_PATH)))
+    if backend == "supabase":
+        return SupabaseStorage()
+    if backend == "export":  # read-only, from `python export.py` files
+        from export import ExportStorage
+        return ExportStorage()
+    raise RuntimeError(f"❌ Unknown STATS_BACKEND {backend!r} (use supabase, sqlite or export)")
@@ -1,159 +1,104 @@
 import os
-import json
+from pathlib import Path
 import pandas as pd
 import streamlit as st
-from supabase import create_client, Client
 from dotenv import load_dotenv
+import metrics
+import sections
+from sections import PAIR_MAP
+from snapshot import read_headers, read_snapshot
+from storage import Storage, get_storage
 
 # -------------------- Setup --------------------
 load_dotenv()
 st.set_page_config(page_title="🏈 Steelers Stats Dashboard", layout="wide")
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
-if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-    st.error("❌ Missing Supabase credentials.")
-    st.stop()
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
-
-@st.cache_data(ttl=60)
-def fetch_all():
-    res = supabase.table("steelers_stats").select("*").execute()
-    return pd.DataFrame(res.data or [])
-
-df = fetch_all()
-if df.empty:
-    st.title("🏈 Pittsburgh Steelers 2025 Stats")
-    st.info("No stats found in Supabase.")
-    st.stop()
+# A local columnar snapshot (written by collector.py) skips the database entirely;
+# otherwise rows come from STATS_BACKEND (Supabase, or a local SQLite file)
+SNAPSHOT_PATH = Path(os.getenv("STATS_SNAPSHOT", "data/steelers_stats.arrow"))
+
+# Sections are recomputed only when the data version changes; the version
+# probe itself is a one-row request, re-checked at most every VERSION_TTL seconds.
+VERSION_TTL = int(os.getenv("STATS_VERSION_TTL", "5"))
+SECTION_CACHE_ENTRIES = int(os.getenv("STATS_SECTION_CACHE", "64"))
+
+@st.cache_resource
+def get_store() -> Storage:
+    return get_storage()
+
+@st.cache_data(ttl=VERSION_TTL, show_spinner=False)
+def data_version() -> str:
+    """Cheap change marker: snapshot file identity, or row count + newest id in storage."""
+    if SNAPSHOT_PATH.exists():
+        stat = SNAPSHOT_PATH.stat()
+        return f"snapshot:{stat.st_mtime_ns}:{stat.st_size}"
+    return store.version("steelers_stats")
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_snapshot(path: str, version: str):
+    return read_snapshot(Path(path)), read_headers(Path(path))
+
+@st.cache_data(max_entries=2, show_spinner=False)
+def load_players(version: str) -> dict | None:
+    """{player id: name} from the players table, or None if this backend has no ids."""
+    if not store.player_ids:
+        return None
+    return {row["id"]: row["name"] for row in store.select("players", "id,name")}
+
+if not SNAPSHOT_PATH.exists():
+    try:
+        store = get_store()
+    except RuntimeError as e:
+        st.error(str(e))
+        st.stop()
+
+version = data_version()
+snap, snap_headers = load_snapshot(str(SNAPSHOT_PATH), version) if version.startswith("snapshot:") else (None, {})
 
 # -------------------- Helpers --------------------
-def to_list(x):
-    """Parse Supabase JSON/text column into a Python list."""
-    if isinstance(x, list):
-        return x
-    if isinstance(x, str):
-        try:
-            return json.loads(x)
-        except Exception:
-            # fallback: split by comma if a plain string somehow
-            return [p.strip() for p in x.split(",")]
-    return []
-
-def expand_kv(df_cat: pd.DataFrame) -> pd.DataFrame:
-    """
-    Expand each Supabase row where stat_key/stat_value are arrays
-    into a flat dict (one row per player/stat record).
-    """
-    out = []
-    for _, rec in df_cat.iterrows():
-        keys = to_list(rec.get("stat_key"))
-        vals = to_list(rec.get("stat_value"))
-        row_dict = {k: v for k, v in zip(keys, vals)}
-        # keep any player value on the record (for name tables this is set)
-        if pd.notna(rec.get("player")) and rec.get("player") not in (None, "None", ""):
-            row_dict.setdefault("player", rec["player"])
-        out.append(row_dict)
-    return pd.DataFrame(out) if out else pd.DataFrame()
-
-# Pair names-table with stats-table
-PAIR_MAP = {
-    ("table_0", "table_1"): "Passing Stats",
-    ("table_2", "table_3"): "Rushing Stats",
-    ("table_4", "table_5"): "Receiving Stats",
-    ("table_6", "table_7"): "Defense Stats",
-    ("table_8", "table_9"): "Scoring Stats",
-    ("table_10", "table_11"): "Kicking Stats",
-    ("table_12", "table_13"): "Field Goal Stats",
-    ("table_14", "table_15"): "Punting Stats",
-}
+SECTION_BY_LABEL = {label: tables for tables, label in PAIR_MAP.items()}
 
 def build_section(names_table: str, stats_table: str) -> pd.DataFrame:
-    """
-    Reconstruct a clean table:
-      - expand numeric stats from stats_table
-      - pull player names from names_table ("Name" or 'player')
-      - align by index
-      - drop duplicates and 'Total'
-    """
-    names_src = df[df["category"] == names_table]
-    stats_src = df[df["category"] == stats_table]
-    if stats_src.empty:
-        return pd.DataFrame()
-
-    stats_df = expand_kv(stats_src)
-    names_df = expand_kv(names_src)
-
-    # Get a name list from names_df
-    names_list = []
-    if not names_df.empty:
-        if "player" in names_df.columns and not names_df["player"].isna().all():
-            names_list = names_df["player"].astype(str).tolist()
-        elif "Name" in names_df.columns:
-            names_list = names_df["Name"].astype(str).tolist()
-
-    # Align lengths
-    if names_list:
-        names_list = names_list[: len(stats_df)]
-        if len(names_list) < len(stats_df):
-            names_list += [None] * (len(stats_df) - len(names_list))
-        stats_df.insert(0, "player", names_list)
-    else:
-        # If no names at all, keep whatever is there (likely None)
-        if "player" not in stats_df.columns:
-            stats_df.insert(0, "player", [None] * len(stats_df))
-
-    # Drop team total unless you want it
-    stats_df = stats_df[stats_df["player"] != "Total"]
-
-    # Deduplicate (some sites repeat the set)
-    stats_df = stats_df.drop_duplicates()
-
-    # Convert numeric columns when possible (keep player as string)
-    for col in stats_df.columns:
-        if col == "player":
-            continue
-        stats_df[col] = pd.to_numeric(stats_df[col], errors="ignore")
-
-    return stats_df
-
-def best_chart_column(label: str, columns: list[str]) -> str | None:
-    if label.startswith("Passing") and "YDS" in columns: return "YDS"
-    if label.startswith("Rushing") and "CAR" in columns: return "CAR"
-    if label.startswith("Receiving") and "REC" in columns: return "REC"
-    # General fallbacks
-    for cand in ("YDS", "TD", "GP"):
-        if cand in columns: return cand
-    return None
+    """Fetch a section's rows from storage and rebuild it with the vectorized path."""
+    return sections.storage_section(store, names_table, stats_table, load_players(version))
+
+def build_section_snapshot(names_table: str, stats_table: str) -> pd.DataFrame:
+    """Same table as build_section, read from the typed snapshot (no JSON or string parsing)."""
+    return sections.snapshot_section(snap, snap_headers, names_table, stats_table)
+
+# Shared by every session: LRU-bounded, keyed by (section, data version)
+@st.cache_data(max_entries=SECTION_CACHE_ENTRIES, show_spinner=False)
+def load_section(label: str, version: str):
+    names_tbl, stats_tbl = SECTION_BY_LABEL[label]
+    with metrics.span("section_build", section=label, source="snapshot" if snap is not None else "storage") as s:
+        if snap is not None:
+            section = build_section_snapshot(names_tbl, stats_tbl)
+        else:
+            section = build_section(names_tbl, stats_tbl)
+        s.add(rows=len(section))
+    return section, sections.chart_series(label, section)
 
 # -------------------- UI --------------------
 st.title("🏈 Pittsburgh Steelers 2025 Stats")
 
-for (names_tbl, stats_tbl), label in PAIR_MAP.items():
-    section = build_section(names_tbl, stats_tbl)
+# Streamlit runs every tab/expander body on each rerun, so an explicit
+# selection decides which sections get fetched at all.
+selected = st.pills(
+    "Sections",
+    list(SECTION_BY_LABEL),
+    selection_mode="multi",
+    default=[next(iter(SECTION_BY_LABEL))],
+)
+if not selected:
+    st.info("Pick one or more sections to load.")
+
+for label in selected or []:
+    section, chart = load_section(label, version)
     if section.empty:
+        st.info(f"No {label.lower()} found.")
         continue
 
     st.subheader(f"📊 {label}")
     st.dataframe(section, use_container_width=True)
-
-    col = best_chart_column(label, list(section.columns))
-    if col and not section.empty:
-        try:
-            chart_df = section.copy()
-            chart_df[col] = pd.to_numeric(chart_df[col], errors="coerce")
-            # Remove NaN & keep players with a name
-            chart_df = chart_df.dropna(subset=[col])
-            chart_df = chart_df[chart_df["player"].notna()]
-            if not chart_df.empty:
-                st.bar_chart(chart_df.set_index("player")[col])
-        except Exception:
-            pass
-
-
-
-
-
-
-
-
+    if chart is not None:
+        st.bar_chart(chart)
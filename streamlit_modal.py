@@ -2,7 +2,10 @@ from modal import App, Image, asgi_app, Secret
 import os, sys, subprocess
 import json
 import pathlib
-from supabase import create_client
+from bulk_writer import BulkWriter
+from storage import get_storage
+from players import PlayerRegistry, player_fields, row_player_ids
+from stat_schema import TABLE_MAP, typed_row
 
 app = App("steelers-stats")
 
@@ -21,27 +24,7 @@ image = (
 # Paths
 DATA_DIR = pathlib.Path("data")
 JSON_PATH = DATA_DIR / "steelers_stats.json"
-
-# Map ESPN tables → friendly names
-TABLE_MAP = {
-    "table_0": "passing_names",
-    "table_1": "passing_stats",
-    "table_2": "rushing_names",
-    "table_3": "rushing_stats",
-    "table_4": "receiving_names",
-    "table_5": "receiving_stats",
-    "table_6": "defense_names",
-    "table_7": "defense_stats",
-    "table_8": "scoring_names",
-    "table_9": "scoring_stats",
-    "table_10": "kick_names",
-    "table_11": "kick_stats",
-    "table_12": "fg_names",
-    "table_13": "fg_stats",
-    "table_14": "punting_names",
-    "table_15": "punting_stats",
-}
-
+TEAM = "pit"  # whose page steelers_stats.json holds; player ids are keyed by team
 
 def insert_stats():
     if not JSON_PATH.exists():
@@ -51,17 +34,21 @@ def insert_stats():
     with open(JSON_PATH, "r", encoding="utf-8") as f:
         stats = json.load(f)
 
-    # Connect to Supabase
-    SUPABASE_URL = os.environ.get("SUPABASE_URL")
-    SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY")
-
-    if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-        print("⚠️ Missing Supabase credentials")
+    # Connect to the configured backend (Supabase unless STATS_BACKEND=sqlite)
+    try:
+        storage = get_storage()
+    except RuntimeError as e:
+        print(f"⚠️ {e}")
         return
 
-    supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+    print(f"📊 Inserting Steelers stats into {storage.name}...\n")
 
-    print("📊 Inserting Steelers stats into Supabase...\n")
+    writer = BulkWriter(storage)
+    player_ids = {}
+    if storage.player_ids:
+        registry = PlayerRegistry(storage)
+        player_ids = row_player_ids(stats, registry, TEAM)
+        registry.sync()
 
     for table_name, table in stats.items():
         friendly_name = TABLE_MAP.get(table_name, table_name)
@@ -74,20 +61,22 @@ def insert_stats():
         for row in rows[:3]:  # print preview
             print(" | ".join(row.get(h, "") for h in headers))
 
-        # Insert into Supabase
-        for row in rows:
-            player = row.get("Player") or row.get("Name")
-            for key, value in row.items():
+        # Queue for chunked insert into storage
+        ids = player_ids.get(table_name)
+        for i, row in enumerate(rows):
+            player = player_fields(row.get("Player") or row.get("Name"), ids, i)
+            for key, value in typed_row(table_name, row).items():
                 if key not in ["Player", "Name"]:
-                    supabase.table("steelers_stats").insert(
+                    writer.add(
                         {
                             "category": friendly_name,
-                            "player": player,
+                            **player,
                             "stat_key": key,
                             "stat_value": value,
                         }
-                    ).execute()
+                    )
 
+    writer.close()
     print("\n✅ Finished inserting Steelers stats.")
 
 
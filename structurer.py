@@ -1,10 +1,13 @@
 import os
-import re
 import json
+import time
 import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
-from openai import OpenAI
+import metrics
+from llm_cache import LLMCache, cache_key
+from json_stream import RecordStream, extract_records
 
 # Optional: load .env for local runs (ignore if you don't use it)
 try:
@@ -18,14 +21,24 @@ ENDPOINT = os.getenv("OPENAI_BASE_URL", "https://cdong1--azure-proxy-web-app.mod
 API_KEY = os.getenv("OPENAI_API_KEY", "supersecretkey")
 MODEL = os.getenv("OPENAI_DEPLOYMENT", "gpt-4o")
 DEBUG = os.getenv("DEBUG", "0") == "1"
+STREAM = os.getenv("STRUCTURE_STREAM", "0") == "1"
 
-client = OpenAI(base_url=ENDPOINT, api_key=API_KEY)
+client = None  # created on first model call (see get_client)
+
+def get_client():
+    """The OpenAI client, built on first use so importing this module stays cheap."""
+    global client
+    if client is None:
+        from openai import OpenAI
+        client = OpenAI(base_url=ENDPOINT, api_key=API_KEY)
+    return client
 
 # --- Files ---
 DATA_DIR = Path("data")
 RAW_BLOB_PATH = DATA_DIR / "raw_blob.txt"
 META_PATH = DATA_DIR / "meta.txt"
 OUT_JSON_PATH = DATA_DIR / "records.json"
+OUT_NDJSON_PATH = DATA_DIR / "records.ndjson"
 
 SCHEMA = {
     "id": "string (unique id)",
@@ -44,63 +57,19 @@ def read_meta():
                 meta[k.strip()] = v.strip()
     return meta
 
-def clean_llm_output(raw: str) -> str:
+def normalize_records(records, run_url, run_extracted_at, blob_for_id_seed):
     """
-    Make the model output parseable:
-    1) strip triple backtick fences (``` or ```json)
-    2) if still mixed text, extract the first JSON object/array substring
+    Ensure required fields exist and are consistent. source_url/extracted_at
+    come from this run's meta, not the model's echo of them: a cached
+    completion would otherwise replay the run it was first made for.
     """
-    s = raw.strip()
-
-    # Strip fenced code blocks like ```json ... ``` or ``` ... ```
-    if s.startswith("```"):
-        # remove opening ```
-        s = s[3:].lstrip()
-        # drop a leading language tag like 'json'
-        s = re.sub(r"^(json|javascript|js|txt)\s*", "", s, flags=re.IGNORECASE)
-        # remove trailing ``` if present
-        if s.endswith("```"):
-            s = s[:-3].rstrip()
-
-    # If still not pure JSON, try to extract the first {...} or [...]
-    def try_json(x: str):
-        try:
-            return json.loads(x), x
-        except Exception:
-            return None, None
-
-    parsed, used = try_json(s)
-    if parsed is not None:
-        return s  # already valid
-
-    # Find first JSON-looking block
-    first_obj = s.find("{")
-    first_arr = s.find("[")
-    starts = [i for i in [first_obj, first_arr] if i != -1]
-    if starts:
-        start = min(starts)
-        # heuristically find the last closing brace/bracket
-        end_obj = s.rfind("}")
-        end_arr = s.rfind("]")
-        end = max(end_obj, end_arr)
-        if end > start:
-            candidate = s[start : end + 1]
-            parsed, used = try_json(candidate)
-            if parsed is not None:
-                return candidate
-
-    # Give up: return original (caller will print it on failure)
-    return s
-
-def normalize_records(records, fallback_url, fallback_extracted_at, blob_for_id_seed):
-    """Ensure required fields exist and are consistent."""
     out = []
     for rec in records:
         if not isinstance(rec, dict):
             continue
         title = rec.get("title") or ""
-        source_url = rec.get("source_url") or fallback_url or "unknown"
-        extracted_at = rec.get("extracted_at") or fallback_extracted_at or datetime.now(timezone.utc).isoformat()
+        source_url = run_url or rec.get("source_url") or "unknown"
+        extracted_at = run_extracted_at or rec.get("extracted_at") or datetime.now(timezone.utc).isoformat()
         summary = rec.get("summary") or title
 
         _id = rec.get("id")
@@ -117,7 +86,233 @@ def normalize_records(records, fallback_url, fallback_extracted_at, blob_for_id_
         })
     return out
 
-def structure_blob():
+SYSTEM_PROMPT = (
+    "Return ONLY valid JSON (no code fences, no prose). "
+    f"Use this schema exactly: {json.dumps(SCHEMA)}. "
+    "If you can only produce one item, return a JSON OBJECT; if many, a JSON ARRAY of objects."
+)
+
+# --- Chunking (env or defaults) ---
+CHUNK_TOKENS = int(os.getenv("STRUCTURE_CHUNK_TOKENS", "6000"))
+CHUNK_CONCURRENCY = int(os.getenv("STRUCTURE_CONCURRENCY", "4"))
+CHUNK_RETRIES = int(os.getenv("STRUCTURE_RETRIES", "2"))
+CHARS_PER_TOKEN = 4  # rough budget; no tokenizer dependency
+BOUNDARIES = ("\n\n", "\n", ". ", " ")
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def split_blob(blob: str, max_tokens: int = CHUNK_TOKENS) -> list[str]:
+    """
+    Split text into chunks of at most ~max_tokens, cutting on the coarsest
+    natural boundary that fits: paragraphs, then lines, sentences, words.
+    """
+    max_chars = max(1, max_tokens * CHARS_PER_TOKEN)
+
+    def pack(text: str, seps: tuple) -> list[str]:
+        if len(text) <= max_chars:
+            return [text]
+        if not seps:
+            return [text[i : i + max_chars] for i in range(0, len(text), max_chars)]
+        sep, finer = seps[0], seps[1:]
+        chunks, current = [], ""
+        for part in text.split(sep):
+            for piece in pack(part, finer):
+                candidate = f"{current}{sep}{piece}" if current else piece
+                if len(candidate) <= max_chars:
+                    current = candidate
+                else:
+                    if current:
+                        chunks.append(current)
+                    current = piece
+        if current:
+            chunks.append(current)
+        return chunks
+
+    return [c.strip() for c in pack(blob, BOUNDARIES) if c.strip()]
+
+def build_messages(text: str, source_url: str, extracted_at: str) -> list:
+    user = (
+        f"Source URL: {source_url}\n"
+        f"Extracted at: {extracted_at}\n\n"
+        f"TEXT:\n{text}"
+    )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user}
+    ]
+
+def parse_records(raw: str) -> list:
+    """Model output → list of records; ValueError if it holds no JSON object/array."""
+    try:
+        return extract_records(raw)
+    except ValueError:
+        raise ValueError(f"LLM output has no parseable JSON object or array. Here is what the model returned:\n\n{raw}")
+
+def structure_text(text: str, source_url: str, extracted_at: str,
+                   cache: LLMCache, use_cache: bool = True, quiet: bool = False) -> list:
+    """
+    One model call for `text` (or a cache hit). Only output that parses is
+    cached, so a retry never replays a bad completion.
+    """
+    # Identical model + prompt + schema + text → reuse the stored completion
+    key = cache_key(MODEL, SYSTEM_PROMPT, SCHEMA, text)
+    raw = cache.get(key) if use_cache else None
+    hit = raw is not None
+
+    if not hit:
+        with metrics.span("llm_call", model=MODEL, mode="complete"):
+            resp = get_client().chat.completions.create(
+                model=MODEL,
+                messages=build_messages(text, source_url, extracted_at),
+                temperature=0
+            )
+        raw = resp.choices[0].message.content or ""
+        count_tokens(getattr(resp, "usage", None), text, raw)
+    else:
+        metrics.count("llm_cache_hits", model=MODEL)
+        if not quiet:
+            print(f"♻️  LLM cache hit ({key[:12]}); skipped the model call.")
+
+    if DEBUG:
+        print("----- RAW FROM MODEL -----")
+        print(raw)
+        print("----- END RAW -----")
+
+    records = parse_records(raw)
+    if not hit:
+        cache.put(key, raw, model=MODEL, source_url=source_url)
+    return records
+
+def count_tokens(usage, prompt: str, completion: str) -> None:
+    """LLM token counters: the API's usage when it reports one, else the chars/4 estimate."""
+    if not metrics.ENABLED:
+        return
+    prompt_tokens = getattr(usage, "prompt_tokens", None) or estimate_tokens(prompt)
+    completion_tokens = getattr(usage, "completion_tokens", None) or estimate_tokens(completion)
+    metrics.count("llm_prompt_tokens", prompt_tokens, model=MODEL)
+    metrics.count("llm_completion_tokens", completion_tokens, model=MODEL)
+
+def stream_completion(text: str, source_url: str, extracted_at: str):
+    """
+    Yield completion text deltas as the model produces them. The llm_call
+    event is recorded when the stream ends and counts only time spent
+    waiting on the model, not the caller's work between deltas.
+    """
+    fields, waited, usage, out = {}, 0.0, None, []
+    started = t0 = time.perf_counter()  # t0: when the current wait on the model began
+    try:
+        stream = iter(get_client().chat.completions.create(
+            model=MODEL,
+            messages=build_messages(text, source_url, extracted_at),
+            temperature=0,
+            stream=True,
+            stream_options={"include_usage": True}
+        ))
+        while (chunk := next(stream, None)) is not None:
+            waited += time.perf_counter() - t0
+            t0 = None
+            usage = getattr(chunk, "usage", None) or usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                if not out:
+                    fields["first_token_seconds"] = round(time.perf_counter() - started, 3)
+                out.append(chunk.choices[0].delta.content)
+                yield out[-1]
+            t0 = time.perf_counter()
+    except Exception as e:
+        fields["error"] = type(e).__name__
+        raise
+    finally:
+        if t0 is not None:  # the stream ended or failed while we were waiting on it
+            waited += time.perf_counter() - t0
+        metrics.observe("llm_call", waited, fields, model=MODEL, mode="stream")
+    count_tokens(usage, text, "".join(out))
+
+def structure_stream(text: str, source_url: str, extracted_at: str, cache: LLMCache) -> list:
+    """
+    Streaming mode: every record is normalized and appended to records.ndjson
+    the moment its JSON object closes. If the connection drops, the records
+    already written stay on disk.
+    """
+    key = cache_key(MODEL, SYSTEM_PROMPT, SCHEMA, text)
+    cached = cache.get(key)
+    if cached is not None:
+        metrics.count("llm_cache_hits", model=MODEL)
+        print(f"♻️  LLM cache hit ({key[:12]}); skipped the model call.")
+    pieces = [cached] if cached is not None else stream_completion(text, source_url, extracted_at)
+
+    parser = RecordStream()
+    raw, written, seen = [], [], set()
+    started = time.perf_counter()
+    with OUT_NDJSON_PATH.open("w", encoding="utf-8") as out:
+        def emit(records: list) -> None:
+            for rec in normalize_records(records, source_url, extracted_at, text):
+                if rec["id"] in seen:
+                    continue
+                seen.add(rec["id"])
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                out.flush()
+                written.append(rec)
+                if len(written) == 1:
+                    print(f"⚡ First record after {time.perf_counter() - started:.2f}s")
+
+        try:
+            for piece in pieces:
+                raw.append(piece)
+                emit(parser.feed(piece))
+        except Exception as e:
+            print(f"❌ Stream interrupted after {len(written)} record(s) ({e}); kept them in {OUT_NDJSON_PATH}.")
+            raise SystemExit(1)
+
+        full = "".join(raw)
+        if DEBUG:
+            print("----- RAW FROM MODEL -----")
+            print(full)
+            print("----- END RAW -----")
+        if not written:
+            # Nothing closed as a record: fall back to the whole-output parser (and its error message)
+            emit(parse_records(full))
+
+    if cached is None:
+        cache.put(key, full, model=MODEL, source_url=source_url)
+    print(f"✅ Streamed {len(written)} record(s) to {OUT_NDJSON_PATH} in {time.perf_counter() - started:.2f}s")
+    return written
+
+def structure_chunks(chunks: list[str], source_url: str, extracted_at: str, cache: LLMCache,
+                     concurrency: int = CHUNK_CONCURRENCY, retries: int = CHUNK_RETRIES) -> list:
+    """
+    Structure chunks concurrently; each chunk is retried on its own (bypassing
+    the cache after a failure). Returns per-chunk record lists in chunk order.
+    """
+    def run(idx: int, text: str) -> list:
+        for attempt in range(retries + 1):
+            try:
+                return structure_text(text, source_url, extracted_at, cache,
+                                      use_cache=attempt == 0, quiet=True)
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                print(f"⚠️ Chunk {idx + 1}/{len(chunks)} failed ({e.__class__.__name__}); retrying...")
+                time.sleep(2 ** attempt)
+
+    results, failed = [None] * len(chunks), []
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(chunks)))) as pool:
+        futures = {pool.submit(run, i, text): i for i, text in enumerate(chunks)}
+        for fut in as_completed(futures):
+            idx = futures[fut]
+            try:
+                results[idx] = fut.result()
+            except Exception as e:
+                failed.append(idx)
+                print(f"❌ Chunk {idx + 1}/{len(chunks)} failed: {e}")
+
+    if failed:
+        # Finished chunks are cached, so a re-run only redoes these
+        raise SystemExit(f"❌ {len(failed)}/{len(chunks)} chunk(s) failed: {sorted(i + 1 for i in failed)}")
+    print(f"✅ Structured {len(chunks)} chunk(s) ({cache.stats['hits']} from cache).")
+    return results
+
+def structure_blob(cache_mode: str | None = None, chunk_tokens: int = CHUNK_TOKENS, stream: bool = STREAM):
     # --- Guardrails ---
     if not RAW_BLOB_PATH.exists():
         raise SystemExit("❌ data/raw_blob.txt not found. Run the collector first.")
@@ -131,52 +326,53 @@ def structure_blob():
     source_url = meta.get("source_url", "unknown")
     extracted_at = meta.get("extracted_at", now_iso)
 
-    system = (
-        "Return ONLY valid JSON (no code fences, no prose). "
-        f"Use this schema exactly: {json.dumps(SCHEMA)}. "
-        "If you can only produce one item, return a JSON OBJECT; if many, a JSON ARRAY of objects."
-    )
-    user = (
-        f"Source URL: {source_url}\n"
-        f"Extracted at: {extracted_at}\n\n"
-        f"TEXT:\n{blob}"
-    )
+    cache = LLMCache(mode=cache_mode) if cache_mode else LLMCache()
 
-    resp = client.chat.completions.create(
-        model=MODEL,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user}
-        ],
-        temperature=0
-    )
+    if estimate_tokens(blob) <= chunk_tokens:
+        try:
+            if stream:
+                batches = [structure_stream(blob, source_url, extracted_at, cache)]
+            else:
+                batches = [structure_text(blob, source_url, extracted_at, cache)]
+        except ValueError as e:
+            print(f"❌ {e}")
+            raise SystemExit(1)
+    else:
+        chunks = split_blob(blob, chunk_tokens)
+        if stream:
+            print(f"⚠️ --stream only applies to blobs up to {chunk_tokens} tokens; "
+                  f"structuring chunks without streaming ({OUT_NDJSON_PATH} is not written).")
+        print(f"✂️  Blob is ~{estimate_tokens(blob)} tokens; structuring {len(chunks)} chunk(s) "
+              f"with concurrency {CHUNK_CONCURRENCY}.")
+        batches = structure_chunks(chunks, source_url, extracted_at, cache)
 
-    raw = resp.choices[0].message.content or ""
+    stats = cache.save_stats()
     if DEBUG:
-        print("----- RAW FROM MODEL -----")
-        print(raw)
-        print("----- END RAW -----")
+        print("LLM cache stats:", stats)
 
-    cleaned = clean_llm_output(raw)
+    # Merge chunk results, first record per id wins
+    normalized, seen = [], set()
+    for records in batches:
+        for rec in normalize_records(records, source_url, extracted_at, blob):
+            if rec["id"] not in seen:
+                seen.add(rec["id"])
+                normalized.append(rec)
 
-    try:
-        parsed = json.loads(cleaned)
-    except json.JSONDecodeError:
-        print("❌ LLM output still not valid JSON after cleaning. Here is what I tried to parse:\n")
-        print(cleaned)
-        raise SystemExit(1)
-
-    # Normalize to a list
-    if isinstance(parsed, dict):
-        parsed = [parsed]
-    elif not isinstance(parsed, list):
-        print("❌ Parsed JSON is neither object nor array. Got:", type(parsed))
-        raise SystemExit(1)
-
-    normalized = normalize_records(parsed, source_url, extracted_at, blob)
     OUT_JSON_PATH.write_text(json.dumps(normalized, ensure_ascii=False, indent=2), encoding="utf-8")
     print(f"✅ Wrote {OUT_JSON_PATH} with {len(normalized)} record(s).")
 
 if __name__ == "__main__":
-    structure_blob()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Structure data/raw_blob.txt into records.json with the LLM.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--no-cache", action="store_true", help="bypass the LLM response cache")
+    group.add_argument("--refresh-cache", action="store_true", help="call the model and overwrite the cached entry")
+    parser.add_argument("--chunk-tokens", type=int, default=CHUNK_TOKENS,
+                        help="blobs larger than this are split and structured in parallel")
+    parser.add_argument("--stream", action="store_true", default=STREAM,
+                        help="stream the completion and append records to records.ndjson as they arrive")
+    args = parser.parse_args()
 
+    structure_blob("off" if args.no_cache else "refresh" if args.refresh_cache else None,
+                   args.chunk_tokens, args.stream)
@@ -0,0 +1,245 @@
+import json
+import time
+import hashlib
+import random
+import threading
+from types import SimpleNamespace
+from sections import PAIR_MAP
+from storage import Storage
+from collector import NFL_TEAMS
+
+# --- Season shape ---
+SECTION_HEADERS = {
+    "Passing Stats": ["GP", "CMP", "ATT", "CMP%", "YDS", "AVG", "YDS/G", "LNG", "TD", "INT", "SACK", "SYL", "RTG"],
+    "Rushing Stats": ["GP", "CAR", "YDS", "AVG", "LNG", "BIG", "TD", "YDS/G", "FUM", "LST", "FD"],
+    "Receiving Stats": ["GP", "REC", "TGTS", "YDS", "AVG", "TD", "LNG", "BIG", "YDS/G", "FUM", "LST", "YAC", "FD"],
+    "Defense Stats": ["GP", "SOLO", "AST", "TOT", "SACK", "SCKYDS", "TFL", "PD", "INT", "YDS", "LNG", "TD", "FF", "FR"],
+    "Scoring Stats": ["GP", "PASS", "RUSH", "REC", "RET", "TD", "2PT", "PAT", "FG", "PTS"],
+    "Kicking Stats": ["GP", "FGM", "FGA", "FG%", "LNG", "XPM", "XPA", "XP%", "PTS"],
+    "Field Goal Stats": ["GP", "ATT", "YDS", "AVG", "LNG", "TD", "FC"],
+    "Punting Stats": ["GP", "PUNTS", "YDS", "LNG", "AVG", "NET", "PBLK", "IN20", "TB", "FC"],
+}
+FIRST_NAMES = ["Darnell", "Broderick", "DK", "Calvin", "Jaylen", "Najee", "Pat", "Minkah", "Cam", "Chris"]
+LAST_NAMES = ["Freiermuth", "Warren", "Austin", "Pickens", "Harris", "Watt", "Heyward", "Boswell", "Fitzpatrick"]
+POSITIONS = ["QB", "RB", "WR", "TE", "K", "P", "LB", "CB", "S", "DE"]
+
+
+def _stat_text(rng: random.Random, header: str) -> str:
+    """One cell the way ESPN prints it: thousands commas, "75t" long TDs, "--" gaps."""
+    if rng.random() < 0.03:
+        return "--"
+    if "%" in header or header in ("AVG", "RTG", "NET", "YDS/G"):
+        return f"{rng.uniform(0, 120):.1f}"
+    if header == "LNG":
+        return f"{rng.randint(1, 99)}{'t' if rng.random() < 0.2 else ''}"
+    return f"{rng.randint(0, 4500):,}"
+
+
+def team_tables(team: str = "pit", week: int = 1, players: int = 12, seed: int = 0) -> list:
+    """Per section: (title, names, header list, stat rows); the last name is the Total row."""
+    rng = random.Random(f"{seed}:{team}:{week}")
+    tables = []
+    for label, headers in SECTION_HEADERS.items():
+        n = rng.randint(max(1, players // 2), players)
+        names = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(n)]
+        positions = [rng.choice(POSITIONS) for _ in range(n)]
+        rows = [[_stat_text(rng, h) for h in headers] for _ in range(n + 1)]
+        tables.append((label.replace(" Stats", ""), list(zip(names, positions)), headers, rows))
+    return tables
+
+
+def team_page_html(team: str = "pit", week: int = 1, players: int = 12, seed: int = 0,
+                   script_kb: int = 64) -> str:
+    """
+    An ESPN team-stats page: a big inline state script, nav links, and per section
+    a fixed-left names table next to a scrolling stats table (both with a Total row).
+    """
+    rng = random.Random(f"{seed}:{team}:{week}:page")
+    state = {"page": {"content": {"team": team, "week": week, "stats": [
+        {"name": f"player{i}", "vals": [rng.random() for _ in range(20)]} for i in range(script_kb * 2)
+    ]}}}
+    out = [
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">',
+        f"<title>{team.upper()} Stats 2025 Week {week} - ESPN</title>",
+        '<link rel="stylesheet" href="/espn.css"><style>.Table__TD{padding:0 8px}</style>',
+        f"<script>window['__espnfitt__']={json.dumps(state)};</script></head><body>",
+        "<nav>" + "".join(f'<a href="/nfl/team/_/name/{t}"><span>{t.upper()}</span></a>' for t in NFL_TEAMS) + "</nav>",
+        f"<main><section class=\"Card\"><h1>{team.upper()} Stats</h1>",
+    ]
+    for title, names, headers, rows in team_tables(team, week, players, seed):
+        out.append(f'<div class="ResponsiveTable"><div class="Table__Title">{title}</div><div class="flex">')
+        out.append('<table class="Table Table--align-right Table--fixed Table--fixed-left"><thead class="Table__THEAD">'
+                   '<tr class="Table__TR"><th class="Table__TH"><div>Name</div></th></tr></thead><tbody class="Table__TBODY">')
+        for i, (name, pos) in enumerate(names):
+            out.append(f'<tr class="Table__TR Table__TR--sm" data-idx="{i}"><td class="Table__TD"><div class="inline">'
+                       f'<a class="AnchorLink" href="/nfl/player/_/id/{1000 + i}">{name}</a> '
+                       f'<span class="pl2 n10">{pos}</span></div></td></tr>')
+        out.append('<tr class="Table__TR"><td class="Table__TD"><div><span class="fw-bold">Total</span></div></td></tr>'
+                   "</tbody></table>")
+        out.append('<div class="Table__ScrollerWrapper"><div class="Table__Scroller"><table class="Table Table--align-right">'
+                   '<thead class="Table__THEAD"><tr class="Table__TR">')
+        out.append("".join(f'<th class="Table__TH" title="{h}"><a class="AnchorLink" title="{h}" href="#">{h}</a></th>'
+                           for h in headers))
+        out.append('</tr></thead><tbody class="Table__TBODY">')
+        for i, row in enumerate(rows):
+            out.append(f'<tr class="Table__TR Table__TR--sm" data-idx="{i}">'
+                       + "".join(f'<td class="Table__TD"><span>{v}</span></td>' for v in row) + "</tr>")
+        out.append("</tbody></table></div></div></div></div>")
+    out.append("</section></main><footer><p>&copy; ESPN Enterprises, Inc.</p></footer></body></html>")
+    return "\n".join(out)
+
+
+def season_pages(teams: int = 32, weeks: int = 18, players: int = 12, seed: int = 0, script_kb: int = 64):
+    """Yield (team, week, html) for `teams` × `weeks` pages."""
+    for team in NFL_TEAMS[:teams]:
+        for week in range(1, weeks + 1):
+            yield team, week, team_page_html(team, week, players, seed, script_kb)
+
+
+def kv_rows(stats_data: dict) -> list:
+    """steelers_stats rows for one scraped page, shaped like upload_json writes them."""
+    rows = []
+    for table_name, table in stats_data.items():
+        for row in table.get("rows", []):
+            rows.append({
+                "category": table_name,
+                "player": row.get("Player") or row.get("Name"),
+                "stat_key": json.dumps(list(row.keys())),
+                "stat_value": json.dumps(list(row.values())),
+            })
+    return rows
+
+
+def synthetic_kv_rows(n_rows: int, seed: int = 0, dup_every: int = 10):
+    """
+    steelers_stats rows shaped like upload_json writes them (JSON-encoded
+    stat_key/stat_value arrays), split evenly across the 8 sections.
+    Every `dup_every`-th stats record repeats an earlier one, as ESPN sometimes does.
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    per_section = max(1, n_rows // (2 * len(PAIR_MAP)))
+    rows = []
+    for (names_tbl, stats_tbl), label in PAIR_MAP.items():
+        headers = SECTION_HEADERS[label]
+        key_json = json.dumps(headers)
+        stat_values = []
+        for i in range(per_section):
+            name = "Total" if i == per_section - 1 else f"Player {label[:3]} {i}"
+            rows.append({"category": names_tbl, "player": name,
+                         "stat_key": '["Name"]', "stat_value": json.dumps([name])})
+            if i % dup_every == dup_every - 1 and stat_values:
+                vals = stat_values[rng.randrange(len(stat_values))]
+            else:
+                vals = json.dumps([f"{rng.uniform(0, 99):.1f}" if "%" in h or h == "AVG"
+                                   else str(rng.randint(0, 4000)) for h in headers])
+            stat_values.append(vals)
+            rows.append({"category": stats_tbl, "player": None, "stat_key": key_json, "stat_value": vals})
+    return pd.DataFrame(rows)
+
+
+def season_blob(teams: int = 32, weeks: int = 18, seed: int = 0) -> str:
+    """Collector-style raw text: one paragraph of game notes per team-week."""
+    rng = random.Random(seed)
+    paras = []
+    for team in NFL_TEAMS[:teams]:
+        for week in range(1, weeks + 1):
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            paras.append(f"{team.upper()} week {week}: {name} threw for {rng.randint(90, 420)} yards "
+                         f"and {rng.randint(0, 4)} TDs; defense had {rng.randint(0, 7)} sacks.")
+    return "\n\n".join(paras)
+
+
+# --- Offline clients ---
+class FakeStorage(Storage):
+    """
+    In-memory Storage with a fixed per-request latency, to time the insert
+    paths without a network. Rows get Supabase-style integer ids.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.tables = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _request(self):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.requests += 1
+
+    def insert(self, table: str, rows: list) -> None:
+        self._request()
+        with self._lock:
+            stored = self.tables.setdefault(table, [])
+            for row in rows:
+                stored.append({"id": len(stored) + 1, **row})
+
+    def upsert(self, table: str, rows: list, on_conflict: str = "id") -> None:
+        self._request()
+        with self._lock:
+            stored = self.tables.setdefault(table, [])
+            index = {r[on_conflict]: i for i, r in enumerate(stored)}
+            for row in rows:
+                if row[on_conflict] in index:
+                    stored[index[row[on_conflict]]].update(row)
+                else:
+                    index[row[on_conflict]] = len(stored)
+                    stored.append(dict(row))
+
+    def select(self, table: str, columns: str = "*", where: dict | None = None,
+               order: str = "id", limit: int | None = None, after: int | None = None,
+               upto: int | None = None) -> list:
+        self._request()
+        rows = [r for r in self.tables.get(table, []) if all(r.get(k) == v for k, v in (where or {}).items())
+                and (after is None or r["id"] > after) and (upto is None or r["id"] <= upto)]
+        rows.sort(key=lambda r: r.get(order))
+        if columns.strip() != "*":
+            cols = [c.strip() for c in columns.split(",")]
+            rows = [{c: r.get(c) for c in cols} for r in rows]
+        return rows[:limit] if limit is not None else rows
+
+    def version(self, table: str = "steelers_stats") -> str:
+        self._request()
+        stored = self.tables.get(table, [])
+        return f"fake:{len(stored)}:{stored[-1].get('id') if stored else None}"
+
+    def id_range(self, table: str = "steelers_stats", upto: int | None = None) -> tuple:
+        self._request()
+        ids = [r["id"] for r in self.tables.get(table, []) if upto is None or r["id"] <= upto]
+        return (min(ids), max(ids), len(ids)) if ids else (None, None, 0)
+
+
+class FakeLLM:
+    """
+    Stand-in for the OpenAI client (client.chat.completions.create): one record
+    per paragraph of the user prompt, returned fenced with a trailing note like
+    real model output. stream=True yields the same text in small deltas.
+    """
+
+    def __init__(self, latency: float = 0.0, delta_chars: int = 16):
+        self.latency = latency
+        self.delta_chars = delta_chars
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def reply(self, messages: list) -> str:
+        text = messages[-1]["content"].split("TEXT:\n", 1)[-1]
+        records = [{"id": "fake-" + hashlib.sha1(p.encode("utf-8")).hexdigest()[:12], "title": p[:60], "summary": p,
+                    "source_url": "unknown", "extracted_at": "2025-01-01T00:00:00Z"}
+                   for p in text.split("\n\n") if p.strip()]
+        return "```json\n" + json.dumps(records, indent=2) + "\n```\nNote: titles are [truncated]."
+
+    def create(self, model: str, messages: list, temperature: float = 0, stream: bool = False, **_):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        content = self.reply(messages)
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        return (SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + self.delta_chars]))])
+                for i in range(0, len(content), self.delta_chars))
@@ -0,0 +1,193 @@
+from html.parser import HTMLParser
+
+# Elements BeautifulSoup closes immediately (never become parents)
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen",
+    "link", "menuitem", "meta", "param", "source", "track", "wbr",
+    "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+}
+# get_text() ignores strings inside these
+NON_TEXT_TAGS = {"script", "style", "template"}
+
+
+class TableParser(HTMLParser):
+    """
+    Event-driven table extractor. Produces exactly what the BeautifulSoup
+    reference extractor (collector.extract_tables_bs4) returns, without building a tree:
+      - only <table>/<tr>/<th>/<td> get records; every other tag is just a name on the stack
+      - nesting follows BeautifulSoup's html.parser rules (an end tag closes
+        everything opened after its matching start tag; void tags never nest)
+      - cell text = each text run stripped, empty runs dropped, joined with ""
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.stack = []        # [name, record] for every open element
+        self.tables = []       # every table in document (start-tag) order
+        self.open_tables = []
+        self.open_trs = []
+        self.open_cells = []
+        self.non_text = 0      # open script/style/template elements
+        self.pending = []      # current text run
+        self.closed_void = {}  # void tag → count of explicit </tag> to swallow, since the last text or tag
+
+    # --- Text runs ---
+    def handle_data(self, data):
+        if self.closed_void:
+            self.closed_void.clear()
+        if self.open_cells and not self.non_text:
+            self.pending.append(data)
+
+    def _flush_text(self):
+        if self.pending:
+            text = "".join(self.pending).strip()
+            self.pending = []
+            if text:
+                for cell in self.open_cells:
+                    cell["parts"].append(text)
+
+    # --- Markup ---
+    def handle_starttag(self, tag, attrs, void_end_expected=True):
+        self._flush_text()
+        if tag in VOID_TAGS:
+            if void_end_expected:
+                self.closed_void[tag] = self.closed_void.get(tag, 0) + 1
+            return
+        if self.closed_void:
+            self.closed_void.clear()
+
+        record = None
+        if tag == "table":
+            record = {"headers": [], "trs": []}
+            self.tables.append(record)
+            self.open_tables.append(record)
+        elif tag == "tr":
+            record = []
+            for table in self.open_tables:
+                table["trs"].append(record)
+            self.open_trs.append(record)
+        elif tag == "th" or tag == "td":
+            # Reserve a slot now so cells keep start-tag order even when nested
+            slots = []
+            targets = [t["headers"] for t in self.open_tables] if tag == "th" else self.open_trs
+            for target in targets:
+                target.append(None)
+                slots.append((target, len(target) - 1))
+            record = {"parts": [], "slots": slots}
+            self.open_cells.append(record)
+        elif tag in NON_TEXT_TAGS:
+            self.non_text += 1
+
+        self.stack.append((tag, record))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs, void_end_expected=False)
+        if tag not in VOID_TAGS:  # <br/> is complete; its end must not use up an earlier <br>'s
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.closed_void.get(tag):
+            # Redundant </br> etc. right after <br>: dropped without ending the text run
+            self.closed_void[tag] -= 1
+            return
+        if self.closed_void:
+            self.closed_void.clear()
+        self._flush_text()
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return  # stray end tag: ignored, as BeautifulSoup does
+        while len(self.stack) > i:
+            self._pop()
+
+    def _pop(self):
+        tag, record = self.stack.pop()
+        if tag == "table":
+            self.open_tables.pop()
+        elif tag == "tr":
+            self.open_trs.pop()
+        elif tag == "th" or tag == "td":
+            self.open_cells.pop()
+            text = "".join(record["parts"])
+            for target, idx in record["slots"]:
+                target[idx] = text
+        elif tag in NON_TEXT_TAGS:
+            self.non_text -= 1
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_decl(self, decl):
+        self._flush_text()
+
+    def handle_pi(self, data):
+        self._flush_text()
+
+    def unknown_decl(self, data):
+        self._flush_text()
+        # BeautifulSoup keeps CDATA sections as their own text run
+        if data.upper().startswith("CDATA[") and self.open_cells and not self.non_text:
+            self.pending.append(data[6:])
+            self._flush_text()
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        while self.stack:
+            self._pop()
+
+
+def _table_result(table: dict) -> dict:
+    headers = table["headers"]
+    rows = [dict(zip(headers, cells)) for cells in table["trs"][1:] if len(cells) == len(headers)]
+    return {"headers": headers, "rows": rows}
+
+
+def extract_tables(html: str) -> dict:
+    """Parse only the table content of `html` into {"table_N": {"headers", "rows"}}."""
+    parser = TableParser()
+    parser.feed(html)
+    parser.close()
+    return {f"table_{idx}": _table_result(t) for idx, t in enumerate(parser.tables)}
+
+
+class StreamingTableParser(TableParser):
+    """
+    TableParser that hands tables back as soon as they are complete: each time
+    an outermost </table> closes, it and any tables nested in it move to
+    `finished` as (index, table) and are dropped from the parser. Memory is
+    bounded by one table, not the page.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.finished = []
+        self.emitted = 0
+
+    def _pop(self):
+        tag = self.stack[-1][0]
+        super()._pop()
+        if tag == "table" and not self.open_tables:
+            done, self.tables = self.tables, []
+            self.finished.extend(enumerate(done, start=self.emitted))
+            self.emitted += len(done)
+
+    def drain(self):
+        done, self.finished = self.finished, []
+        for idx, table in done:
+            yield f"table_{idx}", _table_result(table)
+
+
+def iter_tables(chunks):
+    """
+    Same (name, {"headers", "rows"}) pairs as extract_tables, in the same order,
+    from HTML fed in pieces (a str or any iterable of str chunks).
+    """
+    parser = StreamingTableParser()
+    for chunk in [chunks] if isinstance(chunks, str) else chunks:
+        parser.feed(chunk)
+        yield from parser.drain()
+    parser.close()
+    yield from parser.drain()
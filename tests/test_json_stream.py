@@ -0,0 +1,140 @@
+import json
+import random
+import pathlib
+import pytest
+import json_stream
+from json_stream import RecordStream, extract_records, scan_json_values
+
+LLM_OUTPUTS = pathlib.Path(__file__).parent.parent / "fixtures" / "llm_outputs.jsonl"
+CORPUS = [json.loads(line) for line in LLM_OUTPUTS.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+# --- Random model output ---
+def random_json(rng, depth: int = 0):
+    """Random JSON value whose strings are full of braces, quotes, escapes and fences."""
+    kind = rng.randrange(7 if depth < 3 else 4)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return rng.choice([True, False, None, 1.5, -0.25])
+    if kind in (2, 3):
+        alphabet = 'ab {}[]",:\\\n\t`é😀'
+        return "".join(rng.choice(alphabet) for _ in range(rng.randrange(12)))
+    if kind in (4, 5):
+        return {f"k{i}{rng.choice('{}[]')}": random_json(rng, depth + 1) for i in range(rng.randrange(4))}
+    return [random_json(rng, depth + 1) for _ in range(rng.randrange(4))]
+
+
+def random_prose(rng) -> str:
+    """Model chatter around the JSON: asides in brackets that are never valid JSON."""
+    words = ["Here", "is", "the", "data", "(see below)", "[note: approximate]", "{source}",
+             "don't", '"quoted"', "[1st]", "{", "]", "`inline`", "-", "\n"]
+    return " ".join(rng.choice(words) for _ in range(rng.randrange(8)))
+
+
+def wrap_output(rng, records: list) -> str:
+    """Render records the ways models do: bare, fenced, one object per line, prose around."""
+    indent = rng.choice([None, 1, 2])
+    style = rng.randrange(4)
+    if style == 0 or len(records) == 1 and rng.random() < 0.5:
+        body = json.dumps(records[0] if len(records) == 1 else records, indent=indent, ensure_ascii=rng.random() < 0.5)
+    elif style == 1:
+        body = "```json\n" + json.dumps(records, indent=indent) + "\n```"
+    elif style == 2:
+        body = "\n".join(json.dumps(r) for r in records)
+    else:
+        body = f"\n{random_prose(rng)}\n".join(json.dumps(r, indent=indent) for r in records)
+    return f"{random_prose(rng)}\n{body}\n{random_prose(rng)}"
+
+
+def reference_scan(text: str) -> list:
+    """Every balanced span tried outermost-first with a full parse: quadratic, but obviously right."""
+    values, covered = [], 0
+    for start, end in sorted(json_stream._spans(text, 0), key=lambda s: (s[0], -s[1])):
+        if start < covered:
+            continue
+        try:
+            values.append(json.loads(text[start:end]))
+        except ValueError:
+            continue
+        covered = end
+    return values
+
+
+# --- Corpus ---
+@pytest.mark.parametrize("case", CORPUS, ids=lambda c: c["name"])
+def test_corpus(case):
+    assert extract_records(case["output"]) == case["expected"]
+
+
+# --- Properties ---
+@pytest.mark.parametrize("seed", range(4))
+def test_wrapped_records_come_back_exactly(seed):
+    rng = random.Random(seed)
+    for case in range(500):
+        records = [{"id": str(case), "v": random_json(rng)} for _ in range(rng.randint(1, 4))]
+        output = wrap_output(rng, records)
+        assert extract_records(output) == records, output
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_bare_json_parses(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        value = random_json(rng)
+        if isinstance(value, (dict, list)):
+            assert scan_json_values(json.dumps(value, indent=rng.choice([None, 2]))) == [value]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_reference_on_noisy_text(seed):
+    rng = random.Random(seed)
+    for _ in range(500):
+        parts = [random_prose(rng) if rng.random() < 0.5 else json.dumps(random_json(rng))
+                 for _ in range(rng.randint(1, 6))]
+        text = " ".join(parts)
+        if rng.random() < 0.3:  # cut somewhere, leaving unbalanced or broken JSON
+            text = text[:rng.randrange(len(text) + 1)]
+        assert scan_json_values(text) == reference_scan(text), text
+
+
+def test_no_json():
+    assert scan_json_values("no brackets here") == []
+    with pytest.raises(ValueError):
+        extract_records("[see below] {source}")
+
+
+# --- Linear time ---
+@pytest.mark.parametrize("text", [
+    "[" * 200 + json.dumps(list(range(2000))) + " oops" + "]" * 200,
+    "[x " * 200 + json.dumps({"k": list(range(2000))}) + "]" * 200,
+    '{"a": ' * 200 + "[" + "1," * 2000 + "]" + "}" * 200,
+    ("note [a] " + json.dumps([{"x": "[y]"}] * 50)) * 40,
+], ids=["broken-nested", "prose-nested", "trailing-comma", "many-asides"])
+def test_each_character_decoded_at_most_twice(monkeypatch, text):
+    decoded = []
+
+    def counting_decode(s, idx):
+        try:
+            value, end = real(s, idx)
+        except ValueError as e:
+            decoded.append(e.pos - idx)
+            raise
+        decoded.append(end - idx)
+        return value, end
+
+    real = json_stream._decode
+    monkeypatch.setattr(json_stream, "_decode", counting_decode)
+    assert scan_json_values(text) == reference_scan(text)
+    assert sum(decoded) <= 2 * len(text)
+
+
+# --- Streaming ---
+@pytest.mark.parametrize("case", CORPUS, ids=lambda c: c["name"])
+def test_record_stream_in_small_pieces(case):
+    expected = [r for r in case["expected"] if isinstance(r, dict)]
+    stream, got = RecordStream(), []
+    text = case["output"]
+    for i in range(0, len(text), 5):
+        got.extend(stream.feed(text[i:i + 5]))
+    assert got == expected
@@ -0,0 +1,57 @@
+import sqlite3
+import pytest
+from players import TOTAL_ID, PlayerRegistry, row_player_ids, split_position
+from storage import SQLiteStorage
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStorage(tmp_path / "steelers.db")
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("T.J. WattLB", ("T.J. Watt", "LB")),
+    ("Chris BoswellPK", ("Chris Boswell", "PK")),
+    ("Kenneth Walker IIIRB", ("Kenneth Walker III", "RB")),
+    ("Nick HerbigOLB", ("Nick Herbig", "OLB")),
+    ("DK Metcalf WR", ("DK Metcalf", "WR")),
+    ("Calvin Austin III", ("Calvin Austin III", None)),
+    ("Total", ("Total", None)),
+])
+def test_split_position(cell, expected):
+    assert split_position(cell) == expected
+
+
+def test_ids_keyed_by_team_and_name(store):
+    registry = PlayerRegistry(store)
+    watt = registry.id_for("T.J. WattLB", "pit")
+    assert registry.id_for("T.J. WattDE", "pit") == watt  # position change keeps the id
+    assert registry.id_for("T.J. WattLB", "hou") != watt  # same name, other team
+    assert registry.id_for("Total", "pit") == TOTAL_ID
+    registry.sync()
+
+    reloaded = PlayerRegistry(store)
+    assert reloaded.id_for("T.J. WattLB", "pit") == watt
+    assert reloaded.names()[watt] == "T.J. Watt"
+    assert reloaded.new == []
+
+
+def test_row_player_ids_pairs_stats_with_names(store):
+    stats = {"table_0": {"rows": [{"Name": "Aaron RodgersQB"}, {"Name": "Total"}]},
+             "table_1": {"rows": [{"YDS": "1,234"}, {"YDS": "1,300"}]}}
+    ids = row_player_ids(stats, PlayerRegistry(store), "pit")
+    assert ids["table_0"] == ids["table_1"] == [1, TOTAL_ID]
+
+
+def test_players_table_from_before_keys(tmp_path):
+    path = tmp_path / "steelers.db"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE players (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("CREATE UNIQUE INDEX players_name ON players (name)")
+        conn.execute("INSERT INTO players VALUES (0, 'Total'), (1, 'Joe SmithQB')")
+    registry = PlayerRegistry(SQLiteStorage(path))
+    # Old rows keep their ids; the same name on two teams no longer collides
+    assert registry.id_for("Joe SmithQB", "pit") == 2
+    assert registry.id_for("Joe SmithQB", "cle") == 3
+    registry.sync()
+    assert registry.names()[1] == "Joe SmithQB"
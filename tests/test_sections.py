@@ -0,0 +1,46 @@
+import json
+import pytest
+from sections import storage_section
+from storage import SQLiteStorage
+
+HEADERS = ["GP", "YDS", "LNG", "CMP%"]
+PLAYERS = {0: "Total", 1: "Joe QB", 2: "Al QB"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStorage(tmp_path / "steelers.db")
+
+
+def passing_rows(values: list, player_ids: bool) -> list:
+    """Passing section rows as upload_json writes them: names table, then stats table."""
+    names = [PLAYERS[pid] for pid in range(1, len(values) + 1)]
+    rows = [{"category": "table_0", "player": name, "stat_key": '["Name"]', "stat_value": json.dumps([name])}
+            for name in names]
+    rows += [{"category": "table_1", "player": None, "stat_key": json.dumps(HEADERS), "stat_value": json.dumps(v),
+              **({"player_id": i + 1} if player_ids else {})} for i, v in enumerate(values)]
+    return rows
+
+
+@pytest.mark.parametrize("player_ids", [False, True], ids=["by-position", "by-id"])
+def test_text_rows_parse_by_schema(store, player_ids):
+    # Rows stored before typed ingest hold ESPN text: separators, "75t", "--"
+    store.insert("steelers_stats", passing_rows([["16", "1,234", "75t", "--"], ["2", "98", "12", "50.0"]],
+                                                player_ids))
+    section = storage_section(store, "table_0", "table_1", PLAYERS if player_ids else None)
+    assert section["player"].tolist() == ["Joe QB", "Al QB"]
+    assert section["YDS"].tolist() == [1234, 98]
+    assert section["LNG"].tolist() == [75, 12]
+    assert section["CMP%"].isna().tolist() == [True, False]
+    assert section["CMP%"].dtype == "float64"
+
+
+def test_typed_rows(store):
+    store.insert("steelers_stats", passing_rows([[16, 1234, 75, None], [2, 98, 12, 50.0]], player_ids=True))
+    section = storage_section(store, "table_0", "table_1", PLAYERS)
+    assert section["YDS"].tolist() == [1234, 98]
+    assert section["player"].tolist() == ["Joe QB", "Al QB"]
+
+
+def test_empty_section(store):
+    assert storage_section(store, "table_0", "table_1", PLAYERS).empty
@@ -0,0 +1,48 @@
+import pathlib
+import pytest
+from collector import extract_tables_bs4
+from table_extractor import extract_tables, iter_tables
+
+FIXTURES_DIR = pathlib.Path(__file__).parent.parent / "fixtures"
+
+TRICKY = {
+    "nested tables": """
+        <table><tr><th>A</th><th>B</th></tr>
+          <tr><td>1<table><tr><th>X</th></tr><tr><td>inner</td></tr></table></td><td>2</td></tr>
+        </table>""",
+    "unclosed td": """
+        <table><tr><th>A</th><th>B</th></tr>
+          <tr><td>1<td>2</tr><tr><td>3<td>4</table>""",
+    "br end tags": """
+        <table><tr><th>Name<br></br>Pos</th><th>YDS</th></tr>
+          <tr><td>Joe<br></br>QB</td><td>1,234</td></tr>
+          <tr><td>Al<br><br></br></br>RB</td><td>75t</td></tr>
+          <tr><td>Ed<br>WR</br></td><td>--</td></tr></table>""",
+    "self-closing voids": """
+        <table><tr><th>A<br/></th><th>B<img src=x></th></tr>
+          <tr><td>1<br><br/></br>x</td><td>2</td></tr></table>""",
+    "unclosed voids before table": "<meta charset=utf-8><link rel=x><img>" * 50 + """
+        <table><tr><th>A</th></tr><tr><td>a</br>b</td></tr></table>""",
+    "scripts and comments": """
+        <table><tr><th>A<!-- c --></th><th><script>x = "<td>";</script>B</th></tr>
+          <tr><td><style>td{}</style>1</td><td>2<![CDATA[3]]></td></tr></table>""",
+    "missing headers": "<table><tr><td>1</td></tr><tr><td>2</td></tr></table><table></table>",
+}
+
+
+@pytest.mark.parametrize("page", sorted(FIXTURES_DIR.glob("*.html")), ids=lambda p: p.name)
+def test_fixture_matches_bs4(page):
+    html = page.read_text(encoding="utf-8")
+    assert extract_tables(html) == extract_tables_bs4(html)
+
+
+@pytest.mark.parametrize("name", TRICKY)
+def test_tricky_markup_matches_bs4(name):
+    assert extract_tables(TRICKY[name]) == extract_tables_bs4(TRICKY[name])
+
+
+@pytest.mark.parametrize("name", TRICKY)
+def test_streamed_in_small_chunks_matches(name):
+    html = TRICKY[name]
+    chunks = [html[i:i + 7] for i in range(0, len(html), 7)]
+    assert dict(iter_tables(chunks)) == extract_tables(html)
@@ -1,88 +1,76 @@
-import os
-import requests
 import json
-import pandas as pd
-from bs4 import BeautifulSoup
-from supabase import create_client
+from bulk_writer import BulkWriter
+from storage import get_storage
+from players import PlayerRegistry, player_fields, row_player_ids
+from archive import team_for
+from collector import fetch_with_retry, parse_page
+from stat_schema import typed_row
 from dotenv import load_dotenv
-load_dotenv()
 
+URL = "https://www.espn.com/nfl/team/stats/_/name/pit"
+DROP_COLUMNS = {"LNG"}  # Example: drop LNG column if exists
 
-# --- Supabase setup ---
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_ANON_KEY = os.environ.get("SUPABASE_ANON_KEY")
-
-if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-    raise RuntimeError("❌ Missing SUPABASE_URL or SUPABASE_ANON_KEY env variables")
-
-supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
 
 # --- Step 1: Scrape ESPN Steelers stats ---
 def collect_stats(url: str):
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/123.0.0.0 Safari/537.36"
-        )
-    }
-    r = requests.get(url, headers=headers, timeout=30)
-    r.raise_for_status()
-
-    soup = BeautifulSoup(r.text, "html.parser")
-    tables = soup.find_all("table")
-
-    stats_data = {}
-    for idx, table in enumerate(tables):
-        headers = [th.get_text(strip=True) for th in table.find_all("th")]
-        rows = []
-        for tr in table.find_all("tr")[1:]:
-            cells = [td.get_text(strip=True) for td in tr.find_all("td")]
-            if len(cells) == len(headers):
-                rows.append(dict(zip(headers, cells)))
-        stats_data[f"table_{idx}"] = {"headers": headers, "rows": rows}
-
-    return stats_data
-
-
-# --- Step 2: Collect Steelers stats ---
-url = "https://www.espn.com/nfl/team/stats/_/name/pit"
-stats = collect_stats(url)
-
-print("📊 Scraped tables:", list(stats.keys()))
+    r = fetch_with_retry(url)
+    return parse_page(r.text)
+
+
+def insert_stats(stats: dict, storage, team: str) -> None:
+    """Insert every scraped table of `team`'s page into steelers_stats as key/value rows."""
+    # Stats rows reference players by stable id (names/stats tables joined once, here);
+    # new players are stored before any row that points at them
+    player_ids = {}
+    if storage.player_ids:
+        registry = PlayerRegistry(storage)
+        player_ids = row_player_ids(stats, registry, team)
+        registry.sync()
+
+    writer = BulkWriter(storage)
+    for table_name, table in stats.items():
+        rows = table.get("rows", [])
+        if not rows:
+            continue  # skip empty tables
+
+        print(f"\n📥 Queueing {len(rows)} rows from {table_name}...")
+
+        # Stat cells are parsed once here, so stat_value holds JSON numbers, not ESPN text
+        rows_to_insert = [typed_row(table_name, {k: v for k, v in row.items() if k not in DROP_COLUMNS})
+                          for row in rows]
+
+        ids = player_ids.get(table_name)
+        writer.extend({
+            "category": table_name,
+            **player_fields(row.get("Player") or row.get("Name"), ids, i),
+            "stat_key": json.dumps(list(row.keys())),
+            "stat_value": json.dumps(list(row.values())),
+        } for i, row in enumerate(rows_to_insert))
 
-# --- Step 3: Insert ALL tables into Supabase ---
-for table_name, table in stats.items():
-    headers = table.get("headers", [])
-    rows = table.get("rows", [])
-    if not rows:
-        continue  # skip empty tables
+    writer.close()
 
-    df = pd.DataFrame(rows)
 
-    # Example: drop LNG column if exists
-    if "LNG" in df.columns:
-        df = df.drop(columns=["LNG"])
+def upload(url: str = URL) -> None:
+    load_dotenv()
 
-    print(f"\n📥 Inserting {len(df)} rows from {table_name}...")
+    # --- Storage setup (Supabase unless STATS_BACKEND=sqlite) ---
+    storage = get_storage()
 
-    rows_to_insert = df.to_dict(orient="records")
+    # --- Step 2: Collect Steelers stats ---
+    stats = collect_stats(url)
 
-    for row in rows_to_insert:
-        supabase.table("steelers_stats").insert({
-            "category": table_name,
-            "player": row.get("Player") or row.get("Name"),
-            "stat_key": json.dumps(list(row.keys())),
-            "stat_value": json.dumps(list(row.values()))
-        }).execute()
+    print("📊 Scraped tables:", list(stats.keys()))
 
-    print(f"✅ Inserted {len(rows_to_insert)} rows from {table_name}")
+    # --- Step 3: Insert ALL tables into storage ---
+    insert_stats(stats, storage, team_for(url))
 
-# --- Step 4: Verify by reading back ---
-response = supabase.table("steelers_stats").select("*").limit(10).execute()
+    # --- Step 4: Verify by reading back ---
+    sample = storage.select("steelers_stats", limit=10)
 
-print("\n🔎 Sample from Supabase:")
-for record in response.data:
-    print(record)
+    print(f"\n🔎 Sample from {storage.name}:")
+    for record in sample:
+        print(record)
 
 
+if __name__ == "__main__":
+    upload()